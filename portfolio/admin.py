@@ -1,10 +1,13 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from django.db.models import Count
+from django.db.models import Count, Q
+from django.utils import timezone
+from .exports import export_response
+from .search import matching_messages
 from .models import (
     Profile, Education, SkillCategory, Skill, Project, ProjectTag,
     Achievement, CertificateCategory, Certificate, GalleryImage,
-    ContactMessage, TypingText
+    ContactMessage, EmailOutbox, TypingText
 )
 
 
@@ -19,11 +22,19 @@ class SkillInline(admin.TabularInline):
     extra = 1
     fields = ('name', 'icon_class', 'proficiency', 'order', 'is_active')
 
+    def get_queryset(self, request):
+        # Skill.__str__ shows the category name on every row
+        return super().get_queryset(request).select_related('category')
+
 
 class ProjectTagInline(admin.TabularInline):
     model = ProjectTag
     extra = 2
 
+    def get_queryset(self, request):
+        # ProjectTag.__str__ shows the project title on every row
+        return super().get_queryset(request).select_related('project')
+
 
 class CertificateInline(admin.TabularInline):
     model = Certificate
@@ -59,9 +70,7 @@ class ProfileAdmin(admin.ModelAdmin):
 
     def has_add_permission(self, request):
         # Only allow one profile
-        if Profile.objects.exists():
-            return False
-        return True
+        return Profile.get_solo() is None
 
     def has_delete_permission(self, request, obj=None):
         return False
@@ -83,13 +92,19 @@ class SkillCategoryAdmin(admin.ModelAdmin):
     inlines = [SkillInline]
     ordering = ('order',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            active_skill_count=Count('skills', filter=Q(skills__is_active=True))
+        )
+
     def icon_preview(self, obj):
         return format_html('<i class="{}"></i> {}', obj.icon_class, obj.icon_class)
     icon_preview.short_description = 'Icon'
 
     def skill_count(self, obj):
-        return obj.skills.filter(is_active=True).count()
+        return obj.active_skill_count
     skill_count.short_description = 'Active Skills'
+    skill_count.admin_order_field = 'active_skill_count'
 
 
 @admin.register(Skill)
@@ -97,6 +112,7 @@ class SkillAdmin(admin.ModelAdmin):
     list_display = ('name', 'category', 'proficiency_bar', 'order', 'is_active')
     list_editable = ('order', 'is_active')
     list_filter = ('category', 'is_active')
+    list_select_related = ('category',)
     search_fields = ('name',)
     ordering = ('category', 'order')
 
@@ -133,7 +149,7 @@ class ProjectAdmin(admin.ModelAdmin):
 
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height:50px;max-width:80px;border-radius:5px;"/>', obj.image.url)
+            return format_html('<img src="{}" style="max-height:50px;max-width:80px;border-radius:5px;"/>', obj.image_url or obj.image.url)
         return "No image"
     image_preview.short_description = 'Preview'
 
@@ -164,9 +180,15 @@ class CertificateCategoryAdmin(admin.ModelAdmin):
     inlines = [CertificateInline]
     ordering = ('order',)
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            active_certificate_count=Count('certificates', filter=Q(certificates__is_active=True))
+        )
+
     def certificate_count(self, obj):
-        return obj.certificates.filter(is_active=True).count()
+        return obj.active_certificate_count
     certificate_count.short_description = 'Certificates'
+    certificate_count.admin_order_field = 'active_certificate_count'
 
 
 @admin.register(Certificate)
@@ -174,6 +196,7 @@ class CertificateAdmin(admin.ModelAdmin):
     list_display = ('title', 'issuer', 'category', 'has_file', 'order', 'is_active')
     list_editable = ('order', 'is_active')
     list_filter = ('category', 'is_active')
+    list_select_related = ('category',)
     search_fields = ('title', 'issuer')
     ordering = ('order',)
 
@@ -196,7 +219,7 @@ class GalleryImageAdmin(admin.ModelAdmin):
 
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" style="max-height:60px;max-width:60px;border-radius:50%;object-fit:cover;"/>', obj.image.url)
+            return format_html('<img src="{}" style="max-height:60px;max-width:60px;border-radius:50%;object-fit:cover;"/>', obj.image_url or obj.image.url)
         return "No image"
     image_preview.short_description = 'Preview'
 
@@ -209,6 +232,7 @@ class ContactMessageAdmin(admin.ModelAdmin):
     search_fields = ('name', 'email', 'subject', 'message')
     readonly_fields = ('name', 'email', 'subject', 'message', 'created_at')
     ordering = ('-created_at',)
+    actions = ['export_csv', 'export_ndjson']
 
     def has_add_permission(self, request):
         return False
@@ -216,6 +240,22 @@ class ContactMessageAdmin(admin.ModelAdmin):
     def has_change_permission(self, request, obj=None):
         return True
 
+    def get_search_results(self, request, queryset, search_term):
+        # The full-text index instead of icontains scans over every message
+        if not search_term.strip():
+            return queryset, False
+        return matching_messages(queryset, search_term), False
+
+    # Select all with the read status and date filters applied to export a
+    # filtered inbox; ?created_at__gte=...&created_at__lt=... gives any range
+    @admin.action(description='Export selected messages as CSV')
+    def export_csv(self, request, queryset):
+        return export_response(request, queryset, 'csv')
+
+    @admin.action(description='Export selected messages as NDJSON')
+    def export_ndjson(self, request, queryset):
+        return export_response(request, queryset, 'ndjson')
+
     fieldsets = (
         ('Sender Information', {
             'fields': ('name', 'email')
@@ -229,6 +269,25 @@ class ContactMessageAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ('message', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)
+    list_select_related = ('message',)
+    readonly_fields = ('message', 'attempts', 'last_error', 'created_at', 'sent_at')
+    actions = ['retry_now']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Retry selected emails now')
+    def retry_now(self, request, queryset):
+        updated = queryset.exclude(status=EmailOutbox.STATUS_SENT).update(
+            status=EmailOutbox.STATUS_PENDING, next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f'{updated} email(s) queued for retry.')
+
+
 @admin.register(TypingText)
 class TypingTextAdmin(admin.ModelAdmin):
     list_display = ('text', 'order', 'is_active')
@@ -0,0 +1,263 @@
+"""
+Admission control for the contact form.
+
+Requests are checked, cheapest first, against a body size cap, a per-client
+token bucket and a per-process concurrency limit before the view reads the
+body or touches the database.
+
+With REDIS_URL set, the buckets live in Redis and a Lua script refills and
+takes a token in one atomic step, so the limit holds across every worker.
+Without it they are kept per process: the file cache has no atomic
+read-modify-write, and bucket keys there would compete with the page
+cache's version keys for its entries. Each worker then admits its own
+burst, so a client gets at most PORTFOLIO_CONTACT_BURST times the number
+of workers. A Redis failure falls back to the per-process buckets.
+
+Rejections are counted in memory and added to the ShedCount rows with an
+F() update at most every PORTFOLIO_SHED_FLUSH_INTERVAL seconds, so shedding
+a flood costs no write per request. `manage.py shed_counts` shows them.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db.models import F
+from django.http import JsonResponse
+
+from .models import ShedCount
+
+logger = logging.getLogger(__name__)
+
+SHED_REASONS = ('too_large', 'length_required', 'rate_limited', 'overloaded')
+
+BUCKET_KEY = 'portfolio:bucket:{}'
+
+# Refills and takes a token like take_token() does in process; returns the
+# seconds until a token is available, or 0 if one was taken. Lua numbers
+# are truncated in integer replies, so the wait goes back as a string.
+TAKE_TOKEN_SCRIPT = """
+local capacity, refill, now, ttl = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens, updated = tonumber(state[1]), tonumber(state[2])
+if tokens == nil or updated == nil then
+    tokens, updated = capacity, now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - updated) / refill)
+local wait = 0
+if tokens >= 1 then
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens - 1), 'updated', tostring(now))
+else
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    wait = (1 - tokens) * refill
+end
+redis.call('EXPIRE', KEYS[1], ttl)
+return tostring(wait)
+"""
+
+# Per-process buckets, used without Redis or while it is unavailable
+LOCAL_BUCKETS_MAX = 10000
+_local_buckets = {}
+_local_lock = threading.Lock()
+
+_take_token_script = None
+_redis_lock = threading.Lock()
+
+# Rejections not yet added to the database
+_pending_counts = Counter()
+_counts_lock = threading.Lock()
+_next_flush = 0.0
+
+_semaphore = None
+_semaphore_lock = threading.Lock()
+
+
+def client_ip(request):
+    """
+    The client address, skipping PORTFOLIO_PROXY_COUNT trusted proxies.
+    Each proxy appends to X-Forwarded-For, so the client is that many entries from the end.
+    """
+    proxies = settings.PORTFOLIO_PROXY_COUNT
+    if proxies:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',') if ip.strip()]
+        if len(forwarded) >= proxies:
+            return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def _refill(state, now, capacity, refill_seconds):
+    tokens, updated = state if state else (capacity, now)
+    return min(capacity, tokens + max(0, now - updated) / refill_seconds)
+
+
+def get_take_token_script():
+    """The registered Lua script, or None without REDIS_URL"""
+    global _take_token_script
+    if not settings.REDIS_URL:
+        return None
+    if _take_token_script is None:
+        with _redis_lock:
+            if _take_token_script is None:
+                # Required by Django's Redis cache backend, which REDIS_URL turns on
+                import redis
+
+                client = redis.Redis.from_url(settings.REDIS_URL, socket_timeout=1)
+                _take_token_script = client.register_script(TAKE_TOKEN_SCRIPT)
+    return _take_token_script
+
+
+def take_local_token(key, now, capacity, refill_seconds):
+    with _local_lock:
+        tokens = _refill(_local_buckets.get(key), now, capacity, refill_seconds)
+        remaining = tokens - 1 if tokens >= 1 else tokens
+        if len(_local_buckets) >= LOCAL_BUCKETS_MAX:
+            _local_buckets.clear()
+        _local_buckets[key] = (remaining, now)
+    return 0 if tokens >= 1 else (1 - tokens) * refill_seconds
+
+
+def take_token(ip, now=None):
+    """
+    Take one token from the client's bucket.
+    Returns the number of seconds until a token is available, or 0 if one was taken.
+    """
+    now = time.time() if now is None else now
+    capacity = settings.PORTFOLIO_CONTACT_BURST
+    refill_seconds = settings.PORTFOLIO_CONTACT_REFILL_SECONDS
+    key = BUCKET_KEY.format(ip)
+
+    script = get_take_token_script()
+    if script is not None:
+        # An idle bucket is full again after this long, so it can expire
+        timeout = int(capacity * refill_seconds) + 1
+        try:
+            prefix = settings.CACHES['default']['KEY_PREFIX']
+            return float(script(keys=[f'{prefix}:{key}' if prefix else key], args=[capacity, refill_seconds, now, timeout]))
+        except Exception as e:
+            logger.warning("Rate limit store unavailable, using per-process buckets: %s", e)
+    return take_local_token(key, now, capacity, refill_seconds)
+
+
+def get_semaphore():
+    global _semaphore
+    if _semaphore is None:
+        with _semaphore_lock:
+            if _semaphore is None:
+                _semaphore = threading.BoundedSemaphore(settings.PORTFOLIO_CONTACT_MAX_CONCURRENCY)
+    return _semaphore
+
+
+def record_shed(reason):
+    global _next_flush
+    with _counts_lock:
+        _pending_counts[reason] += 1
+        now = time.monotonic()
+        if now < _next_flush:
+            return
+        _next_flush = now + settings.PORTFOLIO_SHED_FLUSH_INTERVAL
+    flush_shed_counts()
+
+
+def flush_shed_counts():
+    """Add this process's pending rejection counts to the ShedCount rows"""
+    with _counts_lock:
+        pending = dict(_pending_counts)
+        _pending_counts.clear()
+    try:
+        for reason, count in list(pending.items()):
+            # The F() update is atomic, so concurrent workers never lose counts
+            if not ShedCount.objects.filter(reason=reason).update(count=F('count') + count):
+                ShedCount.objects.get_or_create(reason=reason)
+                ShedCount.objects.filter(reason=reason).update(count=F('count') + count)
+            del pending[reason]
+    except Exception as e:
+        logger.warning("Could not save shed counts: %s", e)
+        with _counts_lock:
+            _pending_counts.update(pending)
+
+
+# Counts from the last interval would otherwise be lost when the worker exits
+atexit.register(flush_shed_counts)
+
+
+def get_shed_counts():
+    """Rejections per reason across all workers, including this process's unsaved ones"""
+    counts = dict.fromkeys(SHED_REASONS, 0)
+    counts.update(ShedCount.objects.values_list('reason', 'count'))
+    with _counts_lock:
+        for reason, count in _pending_counts.items():
+            counts[reason] = counts.get(reason, 0) + count
+    return counts
+
+
+def reject(reason, status, message, retry_after=None):
+    record_shed(reason)
+    response = JsonResponse({'success': False, 'message': message}, status=status)
+    if retry_after is not None:
+        response['Retry-After'] = str(max(1, int(retry_after + 0.999)))
+    return response
+
+
+def check_admission(request):
+    """Return a rejection response for a request that is too large or too frequent, else None"""
+    try:
+        content_length = int(request.META['CONTENT_LENGTH'])
+    except (KeyError, ValueError):
+        content_length = None
+    if content_length is None:
+        # A chunked body would otherwise be read without the size cap
+        return reject('length_required', 411, 'Content-Length is required.')
+    if content_length > settings.PORTFOLIO_CONTACT_MAX_BODY:
+        return reject('too_large', 413, 'Message is too large.')
+
+    wait = take_token(client_ip(request))
+    if wait:
+        return reject('rate_limited', 429, 'Too many messages, please try again later.', wait)
+    return None
+
+
+def overloaded():
+    return reject('overloaded', 429, 'Server is busy, please try again shortly.', 1)
+
+
+def admission_control(view_func):
+    """Shed contact-form POSTs that are too large, too frequent or arrive while the worker is saturated"""
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _wrapped_view(request, *args, **kwargs):
+            if request.method != 'POST':
+                return await view_func(request, *args, **kwargs)
+            # The rate limit store and the shed counts do blocking I/O, so keep it off the event loop
+            rejection = await sync_to_async(check_admission)(request)
+            if rejection is not None:
+                return rejection
+            semaphore = get_semaphore()
+            if not semaphore.acquire(blocking=False):
+                return overloaded()
+            try:
+                return await view_func(request, *args, **kwargs)
+            finally:
+                semaphore.release()
+
+        return _wrapped_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if request.method != 'POST':
+            return view_func(request, *args, **kwargs)
+        rejection = check_admission(request)
+        if rejection is not None:
+            return rejection
+        semaphore = get_semaphore()
+        if not semaphore.acquire(blocking=False):
+            return overloaded()
+        try:
+            return view_func(request, *args, **kwargs)
+        finally:
+            semaphore.release()
+
+    return _wrapped_view
@@ -5,3 +5,7 @@ class PortfolioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'portfolio'
     verbose_name = 'Portfolio Management'
+
+    def ready(self):
+        from .signals import connect_signals
+        connect_signals()
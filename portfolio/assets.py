@@ -0,0 +1,243 @@
+"""
+Build step for the site's own CSS and JavaScript, run by collectstatic.
+
+PortfolioStaticFilesStorage (storage.py) minifies css/ and js/ while the
+files are collected, before they are fingerprinted and compressed, and
+writes CRITICAL_CSS: the rules of the stylesheet that apply to the markup
+above the fold. index.html inlines that file and loads the full
+stylesheet without blocking rendering.
+
+The minifiers are deliberately conservative: they only drop comments and
+whitespace, never rename or reorder anything. JavaScript keeps its line
+breaks, so code relying on automatic semicolon insertion stays valid.
+"""
+import re
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.template.loader import get_template
+
+# The stylesheet and the page whose first screen gets its CSS inlined
+STYLESHEET = 'css/styles.css'
+CRITICAL_TEMPLATE = 'index.html'
+CRITICAL_CSS = 'css/critical.css'
+# Markup from <body> up to this marker is above the fold (navigation, home and about)
+FOLD_MARKER = '<!-- Skills Section -->'
+
+# Collected files under these directories are minified
+MINIFIED_DIRS = ('css/', 'js/')
+
+_css_token_re = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*'|/\*.*?\*/)''', re.DOTALL)
+_css_punctuation_re = re.compile(r'\s*([{};,>])\s*')
+# A property name, unless what follows is a selector ("a :hover{")
+_css_declaration_re = re.compile(r'([{;])([-\w]+)\s*:\s*(?=[^{}]*[;}])')
+
+# After one of these (or a keyword below), "/" starts a regular expression literal
+_regex_after = set('(,=:[!&|?{};+-*%<>~^')
+_regex_keywords = ('return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'void', 'delete', 'throw', 'yield')
+_js_word_re = re.compile(r'[\w$]+$')
+_js_newlines_re = re.compile(r'\s*\n\s*')
+_js_spaces_re = re.compile(r'[ \t]+')
+# Spaces next to these never separate two tokens that would otherwise merge
+_js_punctuation_re = re.compile(r' ?([{}()\[\];,:=]) ?')
+
+
+def minify_css(css):
+    """Drop comments and the whitespace CSS does not need; strings are kept as they are"""
+    out = []
+    for i, part in enumerate(_css_token_re.split(css)):
+        if i % 2:
+            if not part.startswith('/*'):
+                out.append(part)
+            continue
+        part = ' '.join(part.split())
+        part = _css_punctuation_re.sub(r'\1', part)
+        out.append(part)
+    css = ''.join(out)
+    css = _css_declaration_re.sub(r'\1\2:', css)
+    return css.replace(';}', '}').strip()
+
+
+def _js_segments(js):
+    """Split js into (kind, text) with kind 'code', 'string', 'regex' or 'comment'"""
+    segments = []
+    code_start = i = 0
+    n = len(js)
+
+    def regex_allowed():
+        # Decided by the last code before the "/", skipping comments
+        for kind, text in reversed(segments + [('code', js[code_start:i])]):
+            if kind == 'comment' or not text.strip():
+                continue
+            text = text.rstrip()
+            word = _js_word_re.search(text)
+            return kind == 'code' and (text[-1] in _regex_after or (word is not None and word.group() in _regex_keywords))
+        return True
+
+    while i < n:
+        c = js[i]
+        kind = None
+        if c in '"\'`':
+            end = i + 1
+            while end < n and js[end] != c:
+                end += 2 if js[end] == '\\' else 1
+            end += 1
+            kind = 'string'
+        elif js.startswith('//', i):
+            end = js.find('\n', i)
+            end = n if end == -1 else end
+            kind = 'comment'
+        elif js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            end = n if end == -1 else end + 2
+            kind = 'comment'
+        elif c == '/' and regex_allowed():
+            end, in_class = i + 1, False
+            while end < n and (js[end] != '/' or in_class) and js[end] != '\n':
+                if js[end] == '\\':
+                    end += 1
+                elif js[end] == '[':
+                    in_class = True
+                elif js[end] == ']':
+                    in_class = False
+                end += 1
+            end += 1
+            while end < n and js[end].isalpha():
+                end += 1
+            kind = 'regex'
+        if kind is None:
+            i += 1
+            continue
+        if code_start < i:
+            segments.append(('code', js[code_start:i]))
+        segments.append((kind, js[i:end]))
+        code_start = i = end
+    if code_start < n:
+        segments.append(('code', js[code_start:]))
+    return segments
+
+
+def _squeeze_js(code):
+    code = _js_newlines_re.sub('\n', code)
+    code = _js_spaces_re.sub(' ', code)
+    return _js_punctuation_re.sub(r'\1', code)
+
+
+def minify_js(js):
+    """Drop comments, indentation and blank lines; strings, template literals and regexes are kept"""
+    out = []
+    code = []
+    for kind, text in _js_segments(js):
+        if kind == 'code':
+            code.append(text)
+        elif kind == 'comment':
+            # Keep the line break a comment may stand for, or the tokens it separated
+            code.append('\n' if '\n' in text else ' ')
+        else:
+            out.append(_squeeze_js(''.join(code)))
+            out.append(text)
+            code = []
+    out.append(_squeeze_js(''.join(code)))
+    return ''.join(out).strip()
+
+
+def _css_blocks(css):
+    """Top-level (prelude, body) pairs of minified css; body is None for statements like @import"""
+    blocks = []
+    i = 0
+    while i < len(css):
+        brace = css.find('{', i)
+        semicolon = css.find(';', i)
+        if brace == -1:
+            break
+        if semicolon != -1 and semicolon < brace:
+            blocks.append((css[i:semicolon], None))
+            i = semicolon + 1
+            continue
+        depth, j = 1, brace + 1
+        while j < len(css) and depth:
+            depth += {'{': 1, '}': -1}.get(css[j], 0)
+            j += 1
+        blocks.append((css[i:brace], css[brace + 1:j - 1]))
+        i = j
+    return blocks
+
+
+def _selector_applies(selector, classes, ids, tags):
+    # Pseudo-classes, pseudo-elements and attribute selectors do not narrow it further here
+    selector = re.sub(r'::?[-\w]+(\([^)]*\))?|\[[^\]]*\]', '', selector)
+    return (
+        set(re.findall(r'\.([-\w]+)', selector)) <= classes
+        and set(re.findall(r'#([-\w]+)', selector)) <= ids
+        and set(re.findall(r'(?:^|[\s>+~])([a-z][a-z0-9]*)', selector)) <= tags
+    )
+
+
+def _critical_blocks(css, classes, ids, tags):
+    kept = []
+    for prelude, body in _css_blocks(css):
+        if body is None or prelude.startswith('@font-face'):
+            kept.append((prelude, body))
+        elif prelude.startswith(('@media', '@supports')):
+            inner = _critical_blocks(body, classes, ids, tags)
+            if inner:
+                kept.append((prelude, ''.join(_join_block(*block) for block in inner)))
+        elif prelude.startswith('@'):
+            # @keyframes are added below if a kept rule uses them
+            continue
+        elif any(_selector_applies(selector, classes, ids, tags) for selector in prelude.split(',')):
+            kept.append((prelude, body))
+    return kept
+
+
+def _join_block(prelude, body):
+    return f'{prelude};' if body is None else f'{prelude}{{{body}}}'
+
+
+def extract_critical_css(css, html):
+    """The rules of css (with the @keyframes they use) that match elements in html"""
+    css = minify_css(css)
+    classes = {name for value in re.findall(r'class="([^"]*)"', html) for name in value.split() if '{' not in name}
+    ids = set(re.findall(r'id="([-\w]+)"', html))
+    tags = set(re.findall(r'<([a-z][a-z0-9]*)', html)) | {'html', 'body'}
+    critical = ''.join(_join_block(*block) for block in _critical_blocks(css, classes, ids, tags))
+    for prelude, body in _css_blocks(css):
+        name = prelude.split()[-1] if prelude.startswith('@keyframes') else None
+        if name and re.search(rf'animation(-name)?:[^;}}]*\b{re.escape(name)}\b', critical):
+            critical += _join_block(prelude, body)
+    return critical
+
+
+def above_the_fold(html):
+    """The markup of html from <body> to FOLD_MARKER"""
+    start = html.find('<body')
+    end = html.find(FOLD_MARKER)
+    return html[max(start, 0):end if end != -1 else len(html)]
+
+
+def build_critical_css(css):
+    """Critical CSS of CRITICAL_TEMPLATE for the stylesheet source css"""
+    template_source = get_template(CRITICAL_TEMPLATE).template.source
+    return extract_critical_css(css, above_the_fold(template_source))
+
+
+_critical = None
+
+
+def get_critical_css():
+    """
+    The CSS to inline in index.html: the collected CRITICAL_CSS, or, in
+    development and before collectstatic has run, built from the source stylesheet.
+    """
+    global _critical
+    if _critical is not None and not settings.DEBUG:
+        return _critical
+    if not settings.DEBUG and staticfiles_storage.exists(CRITICAL_CSS):
+        with staticfiles_storage.open(CRITICAL_CSS) as f:
+            critical = f.read().decode('utf-8')
+    else:
+        with open(finders.find(STYLESHEET), encoding='utf-8') as f:
+            critical = build_critical_css(f.read())
+    _critical = critical
+    return critical
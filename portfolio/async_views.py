@@ -0,0 +1,136 @@
+"""
+Async variants of the public views for ASGI deployments.
+
+They mirror views.py but read the content version, cache and snapshot
+through Django's async cache and ORM APIs. Those are not natively async:
+the built-in cache backends and the ORM run the work in a thread through
+sync_to_async, so each request still hops to a thread at least once.
+urls.py routes to these when PORTFOLIO_ASYNC_VIEWS is enabled (asgi.py
+turns it on).
+
+They are currently slower than the sync views under gunicorn:
+`manage.py benchmark_asgi` measured the home page at about 231 rps
+(p50 136 ms) under uvicorn against about 583 rps (p50 54 ms) under
+gunicorn. The Procfile therefore keeps the WSGI deployment.
+"""
+import json
+
+from django.http import JsonResponse
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+from django.views.decorators.csrf import csrf_exempt
+
+from .admission import admission_control
+from .cache import aget_content_version, version_etag
+from .hints import add_link_header, asend_early_hints, home_links
+from .outbox import aenqueue_contact_message
+from .responses import (
+    afind_stored_response, aget_stored_response, astore_response, minify_html, stored_response, streamed_response,
+)
+from .serializers import encode_portfolio
+from .snapshot import acached_last_modified, aget_last_modified, aget_snapshot
+from .timing import phase
+from .views import HTML_CONTENT_TYPE, get_head, get_portfolio_context, page_after_head
+
+
+async def conditional_stored_response(request, name, arender, content_type, minify=None, astream=None, links=None):
+    """
+    Async counterpart of @condition + get_stored_response().
+    Django's condition decorator calls its validator functions synchronously,
+    so the check is done here after awaiting them. With astream, a page that
+    is not stored yet is streamed from astream(version) instead of arender,
+    and Last-Modified is only used if it is known without building the
+    snapshot. links() are sent as early hints once a 304 is ruled out.
+    """
+    version = await aget_content_version()
+    etag = version_etag(version)
+    if astream is not None:
+        last_modified = await acached_last_modified(version)
+    else:
+        last_modified = await aget_last_modified(version)
+    last_modified = int(last_modified.timestamp()) if last_modified else None
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None and links is not None and request.method == 'GET':
+        links = links()
+        await asend_early_hints(request, links)
+    else:
+        links = None
+    if response is None and astream is not None:
+        stored = await afind_stored_response(name, version)
+        if stored is None:
+            response = streamed_response(request, astream(version), content_type, etag)
+        else:
+            response = stored_response(request, stored, etag)
+    if response is None:
+        stored = await aget_stored_response(name, version, lambda: arender(version), content_type, minify)
+        response = stored_response(request, stored, etag)
+    if last_modified and request.method in ('GET', 'HEAD'):
+        response.headers.setdefault('Last-Modified', http_date(last_modified))
+    response.headers.setdefault('ETag', etag)
+    if links:
+        add_link_header(response, links)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+async def render_home(version):
+    snapshot = await aget_snapshot(version)
+    # Rendered without the request: the page needs no context processors, and
+    # the portfolio one would query synchronously
+    with phase('template'):
+        return render_to_string('index.html', get_portfolio_context(snapshot))
+
+
+async def stream_home(version):
+    """views.stream_home() for the async view"""
+    yield get_head()
+    html = minify_html(await render_home(version))
+    yield page_after_head(html)
+    await astore_response('home', version, html, HTML_CONTENT_TYPE)
+
+
+async def encode_api(version):
+    return encode_portfolio(await aget_snapshot(version))
+
+
+async def home(request):
+    """Main portfolio page, rendered and compressed once per content version"""
+    return await conditional_stored_response(
+        request, 'home', render_home, HTML_CONTENT_TYPE, minify=minify_html, astream=stream_home, links=home_links,
+    )
+
+
+@csrf_exempt
+@admission_control
+async def send_message(request):
+    """Handle contact form submission"""
+    if request.method == 'POST':
+        try:
+            data = json.loads(request.body)
+            name = data.get('name', '')
+            email = data.get('email', '')
+            subject = data.get('subject', '')
+            message = data.get('message', '')
+
+            # Save to database; the notification email is sent by the outbox worker
+            await aenqueue_contact_message(name, email, subject, message)
+
+            return JsonResponse({
+                'success': True,
+                'message': 'Message sent successfully!'
+            })
+
+        except Exception as e:
+            return JsonResponse({
+                'success': False,
+                'message': str(e)
+            }, status=500)
+
+    return JsonResponse({'error': 'Method not allowed'}, status=405)
+
+
+async def api_portfolio_data(request):
+    """API endpoint to get all portfolio data as JSON"""
+    return await conditional_stored_response(request, 'api', encode_api, 'application/json')
@@ -0,0 +1,169 @@
+"""
+Helpers for benchmarking the portfolio against a throwaway database.
+
+Benchmarks run inside a freshly created test database with an isolated
+in-memory cache, so they never touch real content or the shared page cache.
+"""
+import json
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from django.contrib import admin
+from django.db import connection
+from django.test.utils import (
+    CaptureQueriesContext, override_settings,
+    setup_test_environment, teardown_test_environment,
+)
+from django.urls import reverse
+
+from .cache import SECTION_LABELS, bump_content_version
+from .seeding import seed_portfolio
+
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'portfolio-benchmark',
+    }
+}
+
+# Measure the request path only: no shedding, and writes stay on the
+# request's thread so their queries are counted
+BENCHMARK_SETTINGS = {
+    'PORTFOLIO_CONTACT_BURST': 10 ** 9,
+    'PORTFOLIO_WRITER_QUEUE': False,
+    'PORTFOLIO_OUTBOX_IN_PROCESS': False,
+}
+
+# Most queries a request may run, whatever the content size. 'cold' is the
+# first request after an edit, 'warm' any later one.
+QUERY_BUDGETS = {
+    'home': {'cold': 10, 'warm': 0},
+    'api': {'cold': 10, 'warm': 0},
+    # BEGIN, two INSERTs, COMMIT
+    'send_message': {'warm': 4},
+    'admin': {'cold': 20, 'warm': 10},
+    # One row's change form, with its inlines and foreign key <select>s
+    'admin_change': {'cold': 18, 'warm': 6},
+}
+
+CONTACT_PAYLOAD = json.dumps({
+    'name': 'Benchmark', 'email': 'benchmark@example.com', 'subject': 'Hello', 'message': 'Hi ' * 100,
+})
+
+
+def public_endpoints():
+    return [
+        ('home', 'home', 'get', reverse('portfolio:home')),
+        ('api', 'api', 'get', reverse('portfolio:api_portfolio')),
+        ('send_message', 'send_message', 'post', reverse('portfolio:send_message')),
+    ]
+
+
+def admin_endpoints():
+    """(name, budget, method, path) for every changelist of the portfolio app"""
+    endpoints = []
+    for model in admin.site._registry:
+        opts = model._meta
+        if opts.app_label == 'portfolio':
+            path = reverse(f'admin:{opts.app_label}_{opts.model_name}_changelist')
+            endpoints.append((f'admin:{opts.model_name}', 'admin', 'get', path))
+    return sorted(endpoints)
+
+
+def admin_change_endpoints():
+    """(name, budget, method, path) for the change form of the first row of every portfolio model"""
+    endpoints = []
+    for model in admin.site._registry:
+        opts = model._meta
+        obj = model.objects.order_by('pk').first() if opts.app_label == 'portfolio' else None
+        if obj is not None:
+            path = reverse(f'admin:{opts.app_label}_{opts.model_name}_change', args=[obj.pk])
+            endpoints.append((f'admin:{opts.model_name}:change', 'admin_change', 'get', path))
+    return sorted(endpoints)
+
+
+def all_endpoints():
+    return public_endpoints() + admin_endpoints() + admin_change_endpoints()
+
+
+def request_endpoint(client, method, path):
+    if method == 'post':
+        return client.post(path, CONTACT_PAYLOAD, content_type='application/json')
+    response = client.get(path)
+    if response.streaming:
+        # A page that is not stored yet renders while it streams
+        b''.join(response.streaming_content)
+    return response
+
+
+def prepare_request(client, method, path, cold):
+    """Put the caches in the state being measured"""
+    if cold:
+        # As after an admin edit: new content version, every section stale
+        bump_content_version(*SECTION_LABELS)
+    else:
+        request_endpoint(client, method, path)
+
+
+@contextmanager
+def benchmark_database(verbosity=0, test_name=None):
+    """
+    Create a migrated test database and isolated cache for the duration of the block.
+    Pass test_name to use an on-disk database instead of SQLite's in-memory default.
+    """
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    old_test_name = connection.settings_dict['TEST'].get('NAME')
+    if test_name:
+        connection.settings_dict['TEST']['NAME'] = test_name
+    connection.creation.create_test_db(verbosity=verbosity, autoclobber=True)
+    try:
+        with override_settings(CACHES=BENCHMARK_CACHES):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity)
+        connection.settings_dict['TEST']['NAME'] = old_test_name
+        teardown_test_environment()
+
+
+def seed_content(projects, skills, tags_per_project=3, categories=5, messages=0):
+    """Replace the portfolio content with synthetic rows of the given size"""
+    seed_portfolio(
+        projects=projects, skills=skills, tags_per_project=tags_per_project,
+        categories=categories, messages=messages, images=False,
+    )
+
+
+def percentile(values, pct):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def peak_allocations(func):
+    """Peak memory (bytes) allocated by Python objects while func runs"""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(func, repeat=5):
+    """Run func repeatedly and report its query count and wall time"""
+    timings = []
+    for _ in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            result = func()
+            timings.append((time.perf_counter() - start) * 1000)
+    return {
+        'queries': len(queries),
+        'median_ms': statistics.median(timings),
+        'min_ms': min(timings),
+        'result': result,
+    }
@@ -0,0 +1,131 @@
+"""
+Content-versioned caching for the public portfolio pages.
+
+Every save or delete on a portfolio model bumps a global content version
+(see signals.py). Cached pages are stored under a key that includes that
+version, so an edit in the admin makes every older entry unreachable
+instead of having to find and delete it.
+
+Each model also has its own version, bumped together with the content
+version. The page sections are cached as template fragments keyed by the
+versions of the models they show, so an edit re-renders only its section.
+"""
+import time
+from datetime import datetime, timezone
+
+from django.core.cache import cache
+
+CONTENT_VERSION_KEY = 'portfolio:content_version'
+CONTENT_CHANGED_AT_KEY = 'portfolio:content_changed_at'
+
+# The models each cached section of index.html reads
+SECTION_MODELS = {
+    'education': ('portfolio.Education',),
+    'skills': ('portfolio.SkillCategory', 'portfolio.Skill'),
+    'projects': ('portfolio.Project', 'portfolio.ProjectTag'),
+    'achievements': ('portfolio.Achievement',),
+    'certificates': ('portfolio.CertificateCategory', 'portfolio.Certificate'),
+    'gallery': ('portfolio.GalleryImage',),
+}
+SECTION_LABELS = sorted({label for labels in SECTION_MODELS.values() for label in labels})
+
+
+def get_content_version():
+    """Return the current content version, creating one if the cache is empty"""
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        # add() keeps whichever worker got there first
+        cache.add(CONTENT_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(CONTENT_VERSION_KEY)
+    return version
+
+
+async def aget_content_version():
+    """get_content_version() for async views"""
+    version = await cache.aget(CONTENT_VERSION_KEY)
+    if version is None:
+        await cache.aadd(CONTENT_VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(CONTENT_VERSION_KEY)
+    return version
+
+
+def model_version_key(label):
+    return f'portfolio:model_version:{label}'
+
+
+def get_model_version(label):
+    """Return the current version of one model ('portfolio.Profile'), creating one if the cache is empty"""
+    key = model_version_key(label)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_content_version(*labels):
+    """
+    Invalidate every versioned cache entry by moving to a new version.
+    The given model labels ('portfolio.Project') get the new version too;
+    pass none of them to leave the section fragments alone.
+    """
+    version = time.time_ns()
+    values = {
+        CONTENT_VERSION_KEY: version,
+        # Deletions leave no updated_at behind, so remember when content last changed
+        CONTENT_CHANGED_AT_KEY: datetime.fromtimestamp(version / 1e9, tz=timezone.utc),
+    }
+    values.update((model_version_key(label), version) for label in labels)
+    cache.set_many(values, timeout=None)
+    return version
+
+
+def _section_versions(found):
+    return {
+        section: '-'.join(str(found[model_version_key(label)]) for label in labels)
+        for section, labels in SECTION_MODELS.items()
+    }
+
+
+def get_section_versions():
+    """Fragment cache version of each section, made of the versions of its models"""
+    keys = [model_version_key(label) for label in SECTION_LABELS]
+    found = cache.get_many(keys)
+    for key in keys:
+        if key not in found:
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key)
+    return _section_versions(found)
+
+
+async def aget_section_versions():
+    """get_section_versions() for async views"""
+    keys = [model_version_key(label) for label in SECTION_LABELS]
+    found = await cache.aget_many(keys)
+    for key in keys:
+        if key not in found:
+            await cache.aadd(key, time.time_ns(), timeout=None)
+            found[key] = await cache.aget(key)
+    return _section_versions(found)
+
+
+def get_content_changed_at():
+    """When content was last saved or deleted, or None if the cache has been cleared since"""
+    return cache.get(CONTENT_CHANGED_AT_KEY)
+
+
+def version_etag(version):
+    return '"%x"' % version
+
+
+async def aget_content_changed_at():
+    return await cache.aget(CONTENT_CHANGED_AT_KEY)
+
+
+def content_etag(request, *args, **kwargs):
+    """Strong ETag for any response derived only from the current content version"""
+    return version_etag(get_content_version())
+
+
+def page_cache_key(name, version):
+    return f'portfolio:page:{name}:{version}'
@@ -0,0 +1,113 @@
+"""
+Streaming CSV/NDJSON exports of the contact inbox.
+
+Messages are read with values_list().iterator(chunk_size) in primary key
+(arrival) order, so only one chunk of rows is held in memory however large
+the inbox is. Each chunk is encoded and yielded as soon as it is fetched,
+so the first bytes go out after the first chunk rather than after the
+last row.
+"""
+import csv
+import json
+from datetime import datetime, time, timedelta
+
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .responses import aiter_chunks
+
+FIELDS = ('id', 'created_at', 'name', 'email', 'subject', 'message', 'is_read')
+
+CONTENT_TYPES = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+DEFAULT_CHUNK_SIZE = 2000
+
+# Leading characters that make spreadsheets evaluate a cell as a formula
+_formula_chars = ('=', '+', '-', '@', '\t', '\r')
+
+
+def parse_bound(value, end=False):
+    """
+    '2024-05-01' or an ISO datetime -> aware datetime.
+    A bare date used as an end bound covers that whole day.
+    """
+    # Dates first: parse_datetime() also accepts a bare date, as midnight
+    day = parse_date(value)
+    if day is not None:
+        parsed = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+    else:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            raise ValueError(f'{value!r} is not a date or datetime.')
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def filter_messages(queryset, since=None, until=None, is_read=None):
+    """Messages created in [since, until) with the given read status; None means any"""
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    if until is not None:
+        queryset = queryset.filter(created_at__lt=until)
+    if is_read is not None:
+        queryset = queryset.filter(is_read=is_read)
+    return queryset
+
+
+class _Echo:
+    """File-like object handing csv.writer's output straight back"""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    # Messages come from a public form; never let them run as spreadsheet formulas
+    if isinstance(value, str) and value.startswith(_formula_chars):
+        return "'" + value
+    return value
+
+
+def _csv_chunk(writer, rows):
+    return ''.join(writer.writerow([_csv_cell(value) for value in row]) for row in rows)
+
+
+def _ndjson_chunk(rows):
+    return ''.join(
+        json.dumps(dict(zip(FIELDS, row)), cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+        for row in rows
+    )
+
+
+def export_chunks(queryset, format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield the export of queryset as str, one piece per chunk_size rows"""
+    writer = csv.writer(_Echo())
+    if format == 'csv':
+        yield writer.writerow(FIELDS)
+
+    rows = []
+    for row in queryset.order_by('pk').values_list(*FIELDS).iterator(chunk_size=chunk_size):
+        rows.append(row)
+        if len(rows) == chunk_size:
+            yield _csv_chunk(writer, rows) if format == 'csv' else _ndjson_chunk(rows)
+            rows = []
+    if rows:
+        yield _csv_chunk(writer, rows) if format == 'csv' else _ndjson_chunk(rows)
+
+
+def export_response(request, queryset, format, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Download of queryset as a StreamingHttpResponse"""
+    chunks = export_chunks(queryset, format, chunk_size)
+    if isinstance(request, ASGIRequest):
+        chunks = aiter_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=f'{CONTENT_TYPES[format]}; charset=utf-8')
+    filename = f"contact-messages-{timezone.now():%Y%m%d-%H%M%S}.{format}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
@@ -0,0 +1,162 @@
+"""
+Link preload hints for the home page.
+
+The browser cannot discover the stylesheet, the script, the font hosts or
+the profile photo until the page's HTML arrives. The early_hints decorator
+(or, for the async home view, conditional_stored_response's links argument)
+announces them up front: as a 103 Early Hints response where the server
+offers one, sent as soon as a 304 is ruled out and before any database or
+template work, and as a Link header on the final response otherwise
+(which CDNs can also turn into Early Hints).
+
+Servers expose 103 Early Hints differently:
+- WSGI: gunicorn puts a wsgi.early_hints callable in the environ.
+- ASGI: servers advertising the http.response.early_hint extension accept
+  that message; early_hints_application (asgi.py) hands the views a way to
+  send it.
+"""
+from functools import wraps
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.conf import settings
+from django.templatetags.static import static
+
+from .assets import STYLESHEET
+from .snapshot import current_snapshot
+
+SCRIPT = 'js/script.js'
+
+# Third-party hosts of the font and icon stylesheets and their font files;
+# font files are fetched with CORS, so their connection needs crossorigin
+PRECONNECT = (
+    ('https://fonts.googleapis.com', False),
+    ('https://fonts.gstatic.com', True),
+    ('https://cdnjs.cloudflare.com', False),
+)
+
+# The sizes attribute of the profile photo in index.html, shared with its preload hint
+PROFILE_IMAGE_SIZES = '(max-width: 768px) 280px, 350px'
+
+# Key of the early hints sender in the ASGI scope
+SCOPE_KEY = 'portfolio.early_hints'
+ASGI_EXTENSION = 'http.response.early_hint'
+
+_static_links = None
+
+
+def static_links():
+    """Hints for the site's own assets and the third-party hosts, fixed for the life of the process"""
+    global _static_links
+    if _static_links is not None and not settings.DEBUG:
+        return _static_links
+    links = [
+        f'<{static(STYLESHEET)}>; rel=preload; as=style',
+        f'<{static(SCRIPT)}>; rel=preload; as=script',
+    ]
+    links += [f'<{url}>; rel=preconnect' + ('; crossorigin' if cors else '') for url, cors in PRECONNECT]
+    _static_links = links
+    return links
+
+
+def image_link(profile):
+    """Preload hint matching the profile photo's <picture>, or None if there is no photo"""
+    if profile is None or not profile.profile_image:
+        return None
+    webp = profile.profile_image_variants.get('webp')
+    if not webp:
+        return f'<{profile.profile_image}>; rel=preload; as=image; fetchpriority=high'
+    srcset = ', '.join(f'{url} {width}w' for width, url in webp)
+    if '"' in srcset:
+        return None
+    # Browsers without WebP support skip the hint, as they skip the <source>
+    return (
+        f'<{webp[-1][1]}>; rel=preload; as=image; type="image/webp"; fetchpriority=high; '
+        f'imagesrcset="{srcset}"; imagesizes="{PROFILE_IMAGE_SIZES}"'
+    )
+
+
+def home_links():
+    """
+    Hints for the home page. The photo is taken from this worker's snapshot
+    without checking the content version, so the hints cost no cache or
+    database round trip; a photo replaced moments ago may be hinted once more.
+    """
+    links = list(static_links())
+    snapshot = current_snapshot()
+    link = image_link(snapshot.profile) if snapshot is not None else None
+    if link:
+        links.append(link)
+    return links
+
+
+def send_early_hints(request, links):
+    """Send links as a 103 Early Hints response if the server supports it"""
+    wsgi_hints = request.META.get('wsgi.early_hints')
+    if wsgi_hints is not None:
+        wsgi_hints([('Link', link) for link in links])
+        return
+    asgi_hints = getattr(request, 'scope', {}).get(SCOPE_KEY)
+    if asgi_hints is not None:
+        async_to_sync(asgi_hints)(links)
+
+
+async def asend_early_hints(request, links):
+    """send_early_hints() for async views"""
+    asgi_hints = request.scope.get(SCOPE_KEY)
+    if asgi_hints is not None:
+        await asgi_hints(links)
+
+
+def add_link_header(response, links):
+    if links and not response.has_header('Link'):
+        response['Link'] = ', '.join(links)
+
+
+def early_hints(links_func):
+    """
+    View decorator sending links_func() as 103 Early Hints before a GET is
+    handled, and as the Link header of the response.
+    """
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def _wrapped_view(request, *args, **kwargs):
+                if request.method != 'GET':
+                    return await view_func(request, *args, **kwargs)
+                links = links_func()
+                await asend_early_hints(request, links)
+                response = await view_func(request, *args, **kwargs)
+                add_link_header(response, links)
+                return response
+
+            return _wrapped_view
+
+        @wraps(view_func)
+        def _wrapped_view(request, *args, **kwargs):
+            if request.method != 'GET':
+                return view_func(request, *args, **kwargs)
+            links = links_func()
+            send_early_hints(request, links)
+            response = view_func(request, *args, **kwargs)
+            add_link_header(response, links)
+            return response
+
+        return _wrapped_view
+
+    return decorator
+
+
+def early_hints_application(application):
+    """
+    Wrap an ASGI application so views can send 103 Early Hints on servers
+    advertising the http.response.early_hint extension.
+    """
+    async def app(scope, receive, send):
+        if scope['type'] == 'http' and ASGI_EXTENSION in (scope.get('extensions') or {}):
+            async def send_hints(links):
+                await send({'type': ASGI_EXTENSION, 'links': [link.encode('latin-1') for link in links]})
+
+            scope = {**scope, SCOPE_KEY: send_hints}
+        await application(scope, receive, send)
+
+    return app
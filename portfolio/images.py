@@ -0,0 +1,182 @@
+"""
+Responsive image derivatives.
+
+When a profile photo, project image or gallery image is uploaded, resized
+WebP and JPEG copies are written next to it at PORTFOLIO_IMAGE_WIDTHS and
+recorded, with the original's dimensions and their public URLs, in the
+model's variants field:
+
+    {'source': 'projects/app.png', 'width': 1600, 'height': 900,
+     'webp': [[320, 'projects/variants/app-320w.webp', '/media/projects/variants/app-320w.webp'], ...],
+     'jpeg': [[320, 'projects/variants/app-320w.jpg', '/media/projects/variants/app-320w.jpg'], ...]}
+
+The responsive_image template tag turns that into srcset/sizes and
+width/height attributes. Images with transparency get no JPEG copies, so
+their fallback stays the original file.
+
+An image Pillow cannot read is recorded as {'failed': name, 'error': ...}
+and served as uploaded; with no 'source', the next save or run of
+`manage.py generate_image_variants` tries it again. Derivatives are
+deleted once the image is replaced or its row deleted, and that change
+is committed, unless another row still shows the same image.
+"""
+import logging
+import posixpath
+from functools import partial
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from .models import Profile, Project, GalleryImage
+
+logger = logging.getLogger(__name__)
+
+# (model, image field, variants field)
+IMAGE_FIELDS = (
+    (Profile, 'profile_image', 'profile_image_variants'),
+    (Project, 'image', 'image_variants'),
+    (GalleryImage, 'image', 'image_variants'),
+)
+
+FORMATS = (
+    ('webp', 'WEBP', 'webp'),
+    ('jpeg', 'JPEG', 'jpg'),
+)
+
+
+def variant_name(name, width, extension):
+    """'projects/app.png' -> 'projects/variants/app-320w.webp'"""
+    directory, filename = posixpath.split(name)
+    stem = posixpath.splitext(filename)[0]
+    return posixpath.join(directory, 'variants', f'{stem}-{width}w.{extension}')
+
+
+def variant_names(variants):
+    """Storage names of every derivative recorded in variants"""
+    return [entry[1] for key, *_ in FORMATS for entry in (variants or {}).get(key, ())]
+
+
+def has_alpha(image):
+    return image.mode in ('RGBA', 'LA', 'PA') or (image.mode == 'P' and 'transparency' in image.info)
+
+
+def generate_variants(field_file):
+    """Write the derivatives of a stored image and return its variants record"""
+    storage = field_file.storage
+    with field_file.open('rb') as f:
+        image = Image.open(f)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+
+    variants = {'source': field_file.name, 'width': image.width, 'height': image.height}
+    widths = sorted({min(width, image.width) for width in settings.PORTFOLIO_IMAGE_WIDTHS})
+    alpha = has_alpha(image)
+    for key, pil_format, extension in FORMATS:
+        if key == 'jpeg' and alpha:
+            continue
+        variants[key] = []
+        for width in widths:
+            height = max(1, round(image.height * width / image.width))
+            resized = image.resize((width, height), Image.LANCZOS) if width < image.width else image
+            if pil_format == 'JPEG':
+                resized = resized.convert('RGB')
+            elif resized.mode not in ('RGB', 'RGBA'):
+                resized = resized.convert('RGBA' if alpha else 'RGB')
+            buffer = BytesIO()
+            resized.save(buffer, pil_format, quality=settings.PORTFOLIO_IMAGE_QUALITY)
+            name = storage.save(variant_name(field_file.name, width, extension), ContentFile(buffer.getvalue()))
+            variants[key].append([width, name, storage.url(name)])
+    return variants
+
+
+def delete_variants(storage, variants):
+    for name in variant_names(variants):
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning("Could not delete image derivative %s: %s", name, e)
+
+
+def discard_variants(model, image_field, variants, exclude_pk=None):
+    """Delete the derivatives in variants after the commit, unless another row still shows their image"""
+    if not variant_names(variants):
+        return
+    source = variants.get('source')
+    if source and model.objects.filter(**{image_field: source}).exclude(pk=exclude_pk).exists():
+        return
+    storage = model._meta.get_field(image_field).storage
+    transaction.on_commit(partial(delete_variants, storage, variants))
+
+
+def update_variants(instance, image_field, variants_field, force=False):
+    """
+    Regenerate the derivatives if the image changed since they were made.
+    Returns True if the variants field was changed.
+    """
+    field_file = getattr(instance, image_field)
+    old = getattr(instance, variants_field) or {}
+    if field_file and not field_file._committed:
+        # Store the upload now (FileField.pre_save would do it next) so it has its final name
+        field_file.save(field_file.name, field_file.file, save=False)
+
+    name = field_file.name if field_file else ''
+    # Records of earlier failures ({'source': name} alone) are retried too
+    if not force and old.get('source', '') == name and (not name or 'width' in old):
+        return False
+
+    new = {}
+    if name:
+        try:
+            new = generate_variants(field_file)
+        except Exception as e:
+            # Unreadable or remote-only files are served as uploaded
+            logger.warning("Could not generate derivatives for %s: %s", name, e)
+            new = {'failed': name, 'error': str(e)}
+    discard_variants(type(instance), image_field, old, exclude_pk=instance.pk)
+    setattr(instance, variants_field, new)
+    return True
+
+
+def image_saving(sender, instance, update_fields=None, raw=False, **kwargs):
+    """pre_save handler keeping the variants field in step with the image field"""
+    if raw:
+        return
+    for model, image_field, variants_field in IMAGE_FIELDS:
+        if sender is model and (update_fields is None or image_field in update_fields):
+            update_variants(instance, image_field, variants_field)
+
+
+def image_deleted(sender, instance, **kwargs):
+    """post_delete handler removing the derivatives of a deleted row's image"""
+    for model, image_field, variants_field in IMAGE_FIELDS:
+        if sender is model:
+            discard_variants(model, image_field, getattr(instance, variants_field))
+
+
+def resolve_variants(storage, variants):
+    """
+    Variants record reduced to what the responsive_image tag needs:
+    {'width': ..., 'height': ..., 'webp': ((320, url), ...), 'jpeg': (...)}
+    The storage is only asked for URLs that were not recorded.
+    """
+    if not variants or 'width' not in variants:
+        return {}
+    resolved = {'width': variants['width'], 'height': variants['height']}
+    for key, *_ in FORMATS:
+        if variants.get(key):
+            resolved[key] = tuple(
+                (entry[0], entry[2] if len(entry) > 2 else storage.url(entry[1])) for entry in variants[key]
+            )
+    return resolved
+
+
+def refresh_variant_urls(storage, variants):
+    """variants with every derivative URL resolved again"""
+    variants = dict(variants or {})
+    for key, *_ in FORMATS:
+        if variants.get(key):
+            variants[key] = [[entry[0], entry[1], storage.url(entry[1])] for entry in variants[key]]
+    return variants
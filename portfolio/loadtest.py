@@ -0,0 +1,227 @@
+"""
+Helpers for load-testing the portfolio against a locally launched server.
+
+seeded_site() prepares a throwaway database and collected static files for
+a production configuration (DEBUG off), launch_server()
+starts the app under a real server process (the Procfile's gunicorn
+command, or an ASGI server) and waits until it accepts connections.
+run_load() drives it with a minimal asyncio HTTP/1.1 client so the load
+generator itself needs nothing beyond the standard library.
+"""
+import asyncio
+import os
+import shlex
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+
+from .benchmarks import benchmark_database, percentile, seed_content
+
+
+@contextmanager
+def seeded_site(**sizes):
+    """
+    Seed a throwaway on-disk SQLite database with seed_content(**sizes) and
+    collect the static files next to it. Yields the environment a server
+    process needs to serve them as in production.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, 'loadtest.sqlite3')
+        with benchmark_database(test_name=db_path):
+            seed_content(**sizes)
+            connection.close()
+            env = {
+                'DEBUG': 'False',
+                'DATABASE_URL': f'sqlite:///{db_path}',
+                'CACHE_DIR': os.path.join(tmp, 'cache'),
+                'STATIC_ROOT': os.path.join(tmp, 'static'),
+                # Contact messages are stored but never emailed
+                'PORTFOLIO_OUTBOX_IN_PROCESS': 'False',
+            }
+            # With DEBUG off, pages name the hashed files from the manifest
+            subprocess.run(
+                [sys.executable, 'manage.py', 'collectstatic', '--noinput', '--verbosity', '0'],
+                cwd=settings.BASE_DIR, env={**os.environ, **env}, check=True,
+            )
+            yield env
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def procfile_command(process='web'):
+    """The command line of a process type in the project's Procfile"""
+    procfile = Path(settings.BASE_DIR) / 'Procfile'
+    for line in procfile.read_text().splitlines():
+        name, _, command = line.partition(':')
+        if name.strip() == process:
+            return shlex.split(command.strip())
+    raise ValueError(f'No {process!r} process in {procfile}')
+
+
+def server_command(server, port, workers):
+    """Command line for one of the supported servers, bound to 127.0.0.1:port"""
+    if server == 'wsgi':
+        return procfile_command() + ['--bind', f'127.0.0.1:{port}', '--workers', str(workers)]
+    if server == 'uvicorn':
+        return [
+            sys.executable, '-m', 'uvicorn', 'portfolio_backend.asgi:application',
+            '--host', '127.0.0.1', '--port', str(port), '--workers', str(workers), '--no-access-log',
+        ]
+    if server == 'daphne':
+        return [sys.executable, '-m', 'daphne', '-b', '127.0.0.1', '-p', str(port), 'portfolio_backend.asgi:application']
+    raise ValueError(f'Unknown server {server!r}')
+
+
+@contextmanager
+def launch_server(command, port, env=None, timeout=30):
+    """Run the server until the block exits; yields once it accepts connections"""
+    process = subprocess.Popen(
+        command, cwd=settings.BASE_DIR, env={**os.environ, **(env or {})},
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f'Server exited: {process.stderr.read().decode(errors="replace")[-2000:]}')
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=0.2).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f'Server did not start within {timeout}s')
+                time.sleep(0.1)
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+class HTTPConnection:
+    """A keep-alive HTTP/1.1 connection that reconnects when the server closes it"""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=b'', headers=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        lines = [f'{method} {path} HTTP/1.1', f'Host: {self.host}:{self.port}', f'Content-Length: {len(body)}']
+        lines += [f'{name}: {value}' for name, value in (headers or {}).items()]
+        self.writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body)
+        await self.writer.drain()
+
+        status = 100
+        # Skip informational responses such as 103 Early Hints
+        while 100 <= status < 200:
+            status_line = await self.reader.readline()
+            if not status_line:
+                raise ConnectionError('Server closed the connection')
+            status = int(status_line.split()[1])
+            response_headers = {}
+            while True:
+                line = await self.reader.readline()
+                if line in (b'\r\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                response_headers[name.strip().lower()] = value.strip()
+
+        if response_headers.get('transfer-encoding') == 'chunked':
+            content = b''
+            while True:
+                size = int((await self.reader.readline()).strip(), 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if not size:
+                    break
+                content += chunk[:-2]
+        else:
+            content = await self.reader.readexactly(int(response_headers.get('content-length', 0)))
+
+        if response_headers.get('connection', '').lower() == 'close':
+            await self.close()
+        return status, response_headers, content
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+class LoadResult:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(lambda: defaultdict(int))
+        self.errors = defaultdict(int)
+        self.elapsed = 0.0
+
+    def summary(self):
+        """Per-endpoint throughput, latency percentiles (ms) and error rate"""
+        rows = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            latencies = self.latencies[name]
+            total = len(latencies) + self.errors[name]
+            failed = self.errors[name] + sum(
+                count for status, count in self.statuses[name].items() if status >= 500
+            )
+            rows[name] = {
+                'requests': total,
+                'rps': total / self.elapsed if self.elapsed else 0.0,
+                'p50_ms': percentile(latencies, 50),
+                'p95_ms': percentile(latencies, 95),
+                'p99_ms': percentile(latencies, 99),
+                'error_rate': failed / total if total else 0.0,
+                'statuses': dict(self.statuses[name]),
+            }
+        return rows
+
+
+async def run_load(port, next_request, duration, concurrency):
+    """
+    Drive the server at 127.0.0.1:port from `concurrency` connections for `duration` seconds.
+    next_request() returns (name, method, path, body, headers) for each request.
+    """
+    result = LoadResult()
+    deadline = time.monotonic() + duration
+
+    async def client():
+        connection = HTTPConnection('127.0.0.1', port)
+        try:
+            while time.monotonic() < deadline:
+                name, method, path, body, headers = next_request()
+                start = time.perf_counter()
+                try:
+                    status, _, _ = await connection.request(method, path, body, headers)
+                except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+                    result.errors[name] += 1
+                    await connection.close()
+                    continue
+                result.latencies[name].append((time.perf_counter() - start) * 1000)
+                result.statuses[name][status] += 1
+        finally:
+            await connection.close()
+
+    start = time.monotonic()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    result.elapsed = time.monotonic() - start
+    return result
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.benchmarks import benchmark_database, seed_content, measure
+from portfolio.cache import get_content_version
+from portfolio.serializers import encode_portfolio
+from portfolio.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Benchmark a cold build of the /api/portfolio/ payload at growing content sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100,1000', help='Comma-separated project counts')
+        parser.add_argument('--skills-per-project', type=int, default=5)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--encoder', help='Dotted path of the JSON encoder to benchmark')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        encoder = None
+        if options['encoder']:
+            from django.utils.module_loading import import_string
+            encoder = import_string(options['encoder'])
+
+        self.stdout.write(f"{'projects':>9} {'skills':>7} {'queries':>8} {'median ms':>10} {'min ms':>8} {'bytes':>9}")
+        with benchmark_database():
+            for size in sizes:
+                seed_content(projects=size, skills=size * options['skills_per_project'])
+                version = get_content_version()
+                stats = measure(lambda: encode_portfolio(build_snapshot(version), encoder), options['repeat'])
+                self.stdout.write(
+                    f"{size:>9} {size * options['skills_per_project']:>7} {stats['queries']:>8} "
+                    f"{stats['median_ms']:>10.2f} {stats['min_ms']:>8.2f} {len(stats['result']):>9}"
+                )
@@ -0,0 +1,63 @@
+import asyncio
+import importlib.util
+import itertools
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from portfolio.loadtest import free_port, launch_server, run_load, seeded_site, server_command
+
+ENDPOINTS = (
+    ('home', '/'),
+    ('api', '/api/portfolio/'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Compare the sync views under gunicorn (WSGI) with the async views under an ASGI server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=5, help='Seconds per endpoint and server')
+        parser.add_argument('--concurrency', type=int, default=32, help='Concurrent client connections')
+        parser.add_argument('--workers', type=int, default=1, help='Server worker processes')
+        parser.add_argument('--asgi-server', choices=('uvicorn', 'daphne'), default='uvicorn')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark seeds a throwaway SQLite database; unset DATABASE_URL.')
+        servers = [('wsgi', 'gunicorn'), (options['asgi_server'], options['asgi_server'])]
+        for _, module in servers:
+            if importlib.util.find_spec(module) is None:
+                raise CommandError(f'{module} is not installed.')
+
+        with seeded_site(projects=50, skills=250) as site_env:
+            self.stdout.write(
+                f"{'server':<10} {'endpoint':<8} {'requests':>9} {'rps':>9} "
+                f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}"
+            )
+            for server, _ in servers:
+                env = {
+                    **site_env,
+                    'CACHE_KEY_PREFIX': server,
+                    'PORTFOLIO_ASYNC_VIEWS': str(server != 'wsgi'),
+                }
+                self.run_server(server, env, options)
+
+    def run_server(self, server, env, options):
+        port = free_port()
+        command = server_command(server, port, options['workers'])
+        try:
+            with launch_server(command, port, env=env):
+                for name, path in ENDPOINTS:
+                    requests = itertools.repeat((name, 'GET', path, b'', {'Accept-Encoding': 'gzip'}))
+                    # The first request renders and stores the page for the rest
+                    asyncio.run(run_load(port, requests.__next__, 0.5, 1))
+                    result = asyncio.run(run_load(port, requests.__next__, options['duration'], options['concurrency']))
+                    row = result.summary()[name]
+                    self.stdout.write(
+                        f"{server:<10} {name:<8} {row['requests']:>9} {row['rps']:>9.0f} "
+                        f"{row['p50_ms']:>8.2f} {row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} "
+                        f"{row['error_rate']:>7.1%}"
+                    )
+        except RuntimeError as e:
+            raise CommandError(f'{server}: {e}')
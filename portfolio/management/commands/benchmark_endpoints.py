@@ -0,0 +1,102 @@
+import json
+import platform
+import statistics
+import time
+from datetime import datetime, timezone
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from portfolio.benchmarks import (
+    BENCHMARK_SETTINGS, QUERY_BUDGETS, all_endpoints, benchmark_database, peak_allocations,
+    prepare_request, request_endpoint, seed_content,
+)
+
+
+class Command(BaseCommand):
+    help = 'Measure query counts, latency and allocations of the public and admin endpoints at several content sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10,100,1000', help='Comma-separated project counts')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--output', help='Write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        results = {
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'budgets': QUERY_BUDGETS,
+            'sizes': [],
+        }
+        failures = []
+
+        with benchmark_database(), override_settings(**BENCHMARK_SETTINGS):
+            user = get_user_model().objects.create_superuser('benchmark', 'benchmark@example.com', 'benchmark')
+            client = Client()
+            client.force_login(user)
+
+            self.stdout.write(
+                f"{'projects':>9} {'endpoint':<28} {'state':<5} {'queries':>8} {'budget':>7} "
+                f"{'median ms':>10} {'peak KiB':>9}"
+            )
+            for size in sizes:
+                seed_content(projects=size, skills=size * 5, messages=size)
+                endpoints = {}
+                for name, budget_name, method, path in all_endpoints():
+                    budgets = QUERY_BUDGETS[budget_name]
+                    endpoints[name] = {}
+                    for state, budget in budgets.items():
+                        row = self.measure(client, method, path, state == 'cold', options['repeat'])
+                        row['budget'] = budget
+                        endpoints[name][state] = row
+                        self.stdout.write(
+                            f"{size:>9} {name:<28} {state:<5} {row['queries']:>8} {budget:>7} "
+                            f"{row['median_ms']:>10.2f} {row['peak_bytes'] / 1024:>9.0f}"
+                        )
+                        if row['queries'] > budget:
+                            failures.append(f'{name} ({state}, {size} projects): {row["queries"]} queries > {budget}')
+                        if row['status'] >= 400:
+                            failures.append(f'{name} ({state}, {size} projects): HTTP {row["status"]}')
+                results['sizes'].append({'projects': size, 'endpoints': endpoints})
+
+        results['failures'] = failures
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        if failures:
+            raise CommandError('Query budget exceeded:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS('All endpoints within their query budgets'))
+
+    def measure(self, client, method, path, cold, repeat):
+        """Query count and status of the last run, median wall time and peak allocations"""
+        def request():
+            return request_endpoint(client, method, path)
+
+        def prepare():
+            prepare_request(client, method, path, cold)
+
+        timings = []
+        for _ in range(repeat):
+            prepare()
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = request()
+                timings.append((time.perf_counter() - start) * 1000)
+            # Read now: the next request resets connection.queries
+            query_count = len(queries)
+        prepare()
+        return {
+            'status': response.status_code,
+            'queries': query_count,
+            'median_ms': statistics.median(timings),
+            'min_ms': min(timings),
+            'peak_bytes': peak_allocations(request),
+        }
@@ -0,0 +1,84 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, OperationalError
+from django.test.utils import override_settings
+
+from portfolio.benchmarks import benchmark_database, seed_content, percentile
+from portfolio.outbox import enqueue_contact_message
+from portfolio.snapshot import build_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Measure home-page read latency on SQLite while contact-form writes are in flight'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--duration', type=float, default=3, help='Seconds per scenario')
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--writers', type=int, default=8)
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('This benchmark only applies to the SQLite database.')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with benchmark_database(test_name=os.path.join(tmp, 'benchmark.sqlite3')):
+                seed_content(projects=50, skills=250)
+                journal_mode = connection.cursor().execute('PRAGMA journal_mode').fetchone()[0]
+                self.stdout.write(f'journal_mode={journal_mode}')
+                self.stdout.write(
+                    f"{'scenario':<22} {'reads':>7} {'read p50':>9} {'read p95':>9} {'read p99':>9} "
+                    f"{'writes':>7} {'locked':>7} {'write p95':>10}"
+                )
+                scenarios = (
+                    ('reads only', 0, True),
+                    ('writes, direct', options['writers'], False),
+                    ('writes, writer queue', options['writers'], True),
+                )
+                for label, writers, use_queue in scenarios:
+                    with override_settings(PORTFOLIO_WRITER_QUEUE=use_queue, PORTFOLIO_OUTBOX_IN_PROCESS=False):
+                        self.run_scenario(label, options['readers'], writers, options['duration'])
+
+    def run_scenario(self, label, readers, writers, duration):
+        stop = threading.Event()
+        read_times, write_times, locked = [], [], []
+
+        def reader():
+            try:
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    build_snapshot(0)
+                    read_times.append((time.perf_counter() - start) * 1000)
+            finally:
+                connection.close()
+
+        def writer():
+            try:
+                while not stop.is_set():
+                    start = time.perf_counter()
+                    try:
+                        enqueue_contact_message('Load', 'load@example.com', 'Benchmark', 'Hello ' * 50)
+                    except OperationalError:
+                        locked.append(1)
+                    else:
+                        write_times.append((time.perf_counter() - start) * 1000)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+        self.stdout.write(
+            f"{label:<22} {len(read_times):>7} {percentile(read_times, 50):>9.2f} "
+            f"{percentile(read_times, 95):>9.2f} {percentile(read_times, 99):>9.2f} "
+            f"{len(write_times):>7} {len(locked):>7} {percentile(write_times, 95):>10.2f}"
+        )
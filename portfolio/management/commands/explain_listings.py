@@ -0,0 +1,78 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from portfolio.benchmarks import benchmark_database, seed_content
+from portfolio.models import ContactMessage, SkillCategory, CertificateCategory, TypingText
+from portfolio.sections import DEFAULT_LIMIT, SECTIONS, after_cursor
+
+# Rows per contact inbox page in the admin
+INBOX_PAGE = 100
+
+
+def listing_queries(size):
+    """(name, queryset) of every paginated listing, at the first page and deep into the table"""
+    queries = []
+    for name, section in SECTIONS.items():
+        queryset = section.model.objects.filter(section.filters).order_by('order', 'pk')
+        queries.append((name, queryset[:DEFAULT_LIMIT + 1]))
+        queries.append((f'{name} (cursor)', after_cursor(queryset, size // 2, 0)[:DEFAULT_LIMIT + 1]))
+    for model in (SkillCategory, CertificateCategory, TypingText):
+        queries.append((str(model._meta.verbose_name_plural).lower(), model.objects.filter(is_active=True)[:DEFAULT_LIMIT]))
+    inbox = ContactMessage.objects.order_by('-created_at', '-pk')
+    queries.append(('inbox', inbox[:INBOX_PAGE]))
+    queries.append(('inbox (unread)', inbox.filter(is_read=False)[:INBOX_PAGE]))
+    queries.append(('inbox (read)', inbox.filter(is_read=True)[:INBOX_PAGE]))
+    return queries
+
+
+def plan_problems(queryset, plan):
+    """Reasons the plan does not read the listing's table through an index in order"""
+    table = queryset.model._meta.db_table
+    problems = []
+    if connection.vendor == 'sqlite':
+        if re.search(rf'SCAN {table}(?! USING)', plan):
+            problems.append(f'full scan of {table}')
+        if 'TEMP B-TREE FOR ORDER BY' in plan:
+            problems.append('sorts the rows')
+    elif connection.vendor == 'postgresql':
+        if f'Seq Scan on {table}' in plan:
+            problems.append(f'sequential scan of {table}')
+        if 'Sort Key' in plan:
+            problems.append('sorts the rows')
+    return problems
+
+
+class Command(BaseCommand):
+    help = 'Seed a throwaway database and check with EXPLAIN that every listing query is served by an index'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=20000,
+                            help='Rows per listing; skills get five times as many')
+        parser.add_argument('--messages', type=int, default=100000, help='Contact messages to seed')
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            raise CommandError(f'EXPLAIN checks support SQLite and PostgreSQL, not {connection.vendor}.')
+        size = options['projects']
+        failures = []
+        with benchmark_database():
+            self.stdout.write(f"Seeding {size} rows per listing and {options['messages']} messages...")
+            seed_content(projects=size, skills=size * 5, messages=options['messages'])
+            # Fresh statistics, as the planner would have in production
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+
+            for name, queryset in listing_queries(size):
+                plan = queryset.explain()
+                problems = plan_problems(queryset, plan)
+                self.stdout.write(f"{name:<28} {'FAIL: ' + ', '.join(problems) if problems else 'ok'}")
+                if problems or options['verbosity'] > 1:
+                    self.stdout.write('    ' + plan.replace('\n', '\n    '))
+                if problems:
+                    failures.append(name)
+
+        if failures:
+            raise CommandError(f"Not served by an index: {', '.join(failures)}")
+        self.stdout.write('Every listing query is served by an index')
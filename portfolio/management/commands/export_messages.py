@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.exports import CONTENT_TYPES, DEFAULT_CHUNK_SIZE, export_chunks, filter_messages, parse_bound
+from portfolio.models import ContactMessage
+
+
+class Command(BaseCommand):
+    help = 'Stream contact messages as CSV or NDJSON without loading the inbox into memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(CONTENT_TYPES), default='csv')
+        parser.add_argument('--output', help='File to write; defaults to stdout')
+        parser.add_argument('--since', help='Only messages created on or after this date or datetime')
+        parser.add_argument('--until', help='Only messages created before this datetime, or up to the end of this date')
+        status = parser.add_mutually_exclusive_group()
+        status.add_argument('--read', dest='is_read', action='store_const', const=True, help='Only read messages')
+        status.add_argument('--unread', dest='is_read', action='store_const', const=False, help='Only unread messages')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows fetched per query')
+
+    def handle(self, *args, **options):
+        try:
+            since = parse_bound(options['since']) if options['since'] else None
+            until = parse_bound(options['until'], end=True) if options['until'] else None
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        queryset = filter_messages(ContactMessage.objects.all(), since, until, options['is_read'])
+        chunks = export_chunks(queryset, options['format'], options['chunk_size'])
+        if not options['output']:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        with open(options['output'], 'w', newline='', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stderr.write(f"Messages written to {options['output']}")
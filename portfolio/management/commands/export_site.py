@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+
+from portfolio.images import IMAGE_FIELDS, variant_names
+from portfolio.models import Profile, Project, Certificate, GalleryImage
+from portfolio.responses import minify_html
+from portfolio.serializers import encode_portfolio
+from portfolio.snapshot import get_snapshot
+from portfolio.templatetags.media_tags import media_url
+from portfolio.views import get_portfolio_context
+
+MANIFEST_NAME = 'manifest.json'
+
+# File fields whose media is linked from the exported pages
+MEDIA_FIELDS = (
+    (Profile, ('profile_image', 'resume')),
+    (Project, ('image',)),
+    (GalleryImage, ('image',)),
+    (Certificate, ('certificate_file',)),
+)
+
+
+def sha256_bytes(content):
+    return hashlib.sha256(content).hexdigest()
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def url_dir(url):
+    """'/static/' -> 'static'"""
+    return url.strip('/')
+
+
+class Command(BaseCommand):
+    help = 'Export the portfolio as static files, rewriting only files whose content changed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help='Directory to write the site into')
+        parser.add_argument(
+            '--skip-collectstatic', action='store_true',
+            help='Use the files already in STATIC_ROOT instead of running collectstatic',
+        )
+
+    def handle(self, *args, **options):
+        self.output = Path(options['output']).resolve()
+        self.output.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.output / MANIFEST_NAME
+        self.old_manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+        self.manifest = {}
+        self.written = 0
+
+        if not options['skip_collectstatic']:
+            call_command('collectstatic', interactive=False, verbosity=0)
+
+        html = render_to_string('index.html', get_portfolio_context())
+        self.write_bytes('index.html', minify_html(html).encode('utf-8'))
+        self.write_bytes('api/portfolio/index.json', encode_portfolio(get_snapshot()))
+
+        static_root = Path(settings.STATIC_ROOT)
+        for path in sorted(p for p in static_root.rglob('*') if p.is_file()):
+            self.copy_file(path, f'{url_dir(settings.STATIC_URL)}/{path.relative_to(static_root).as_posix()}')
+
+        for url in self.local_media_urls():
+            name = unquote(url[len(settings.MEDIA_URL):])
+            source = Path(settings.MEDIA_ROOT) / name
+            if source.is_file():
+                self.copy_file(source, f'{url_dir(settings.MEDIA_URL)}/{name}')
+            else:
+                self.stderr.write(f'Missing media file: {source}')
+
+        removed = 0
+        for relative in set(self.old_manifest) - set(self.manifest):
+            stale = self.output / relative
+            if stale.is_file():
+                stale.unlink()
+                removed += 1
+
+        manifest_path.write_text(json.dumps(self.manifest, indent=2, sort_keys=True))
+        unchanged = len(self.manifest) - self.written
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported to {self.output}: {self.written} written, {unchanged} unchanged, {removed} removed'
+        ))
+
+    def local_media_urls(self):
+        """Media URLs as the template resolves them; Cloudinary URLs stay remote"""
+        urls = set()
+        for model, fields in MEDIA_FIELDS:
+            queryset = model.objects.all() if model is Profile else model.objects.filter(is_active=True)
+            for obj in queryset.only(*fields):
+                for field in fields:
+                    url = media_url(getattr(obj, field))
+                    if url.startswith(settings.MEDIA_URL):
+                        urls.add(url)
+        # Resized copies referenced from srcset
+        for model, image_field, variants_field in IMAGE_FIELDS:
+            storage = model._meta.get_field(image_field).storage
+            queryset = model.objects.all() if model is Profile else model.objects.filter(is_active=True)
+            for variants in queryset.values_list(variants_field, flat=True):
+                for name in variant_names(variants):
+                    url = storage.url(name)
+                    if url.startswith(settings.MEDIA_URL):
+                        urls.add(url)
+        return sorted(urls)
+
+    def is_current(self, relative, digest):
+        return self.old_manifest.get(relative) == digest and (self.output / relative).is_file()
+
+    def target(self, relative):
+        path = self.output / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def write_bytes(self, relative, content):
+        digest = sha256_bytes(content)
+        self.manifest[relative] = digest
+        if self.is_current(relative, digest):
+            return
+        path = self.target(relative)
+        tmp = path.with_name(path.name + '.tmp')
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+        self.written += 1
+
+    def copy_file(self, source, relative):
+        digest = sha256_file(source)
+        self.manifest[relative] = digest
+        if self.is_current(relative, digest):
+            return
+        path = self.target(relative)
+        tmp = path.with_name(path.name + '.tmp')
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, path)
+        self.written += 1
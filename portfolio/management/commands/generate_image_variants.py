@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.images import IMAGE_FIELDS, update_variants
+
+
+class Command(BaseCommand):
+    help = 'Create the resized derivatives for images uploaded before they were generated on save'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true', help='Regenerate derivatives that already exist')
+
+    def handle(self, *args, **options):
+        for model, image_field, variants_field in IMAGE_FIELDS:
+            updated = 0
+            for obj in model.objects.exclude(**{image_field: ''}).exclude(**{f'{image_field}__isnull': True}):
+                if update_variants(obj, image_field, variants_field, force=options['force']):
+                    obj.save(update_fields=[variants_field])
+                    updated += 1
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {updated} updated')
@@ -0,0 +1,118 @@
+import asyncio
+import importlib.util
+import json
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from portfolio.loadtest import free_port, launch_server, run_load, seeded_site, server_command
+
+# Share of requests per endpoint when --mix is not given
+DEFAULT_MIX = 'home=70,api=25,send_message=5'
+
+SERVER_MODULES = {'wsgi': 'gunicorn', 'uvicorn': 'uvicorn', 'daphne': 'daphne'}
+
+
+def parse_mix(value):
+    """'home=70,api=25' -> {'home': 70.0, 'api': 25.0}"""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        if name.strip() not in ('home', 'api', 'send_message') or not weight:
+            raise CommandError(f'Invalid --mix entry {part!r}; use home=N,api=N,send_message=N')
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def request_picker(mix, seed):
+    """Deterministic stream of (name, method, path, body, headers) following the mix"""
+    rng = random.Random(seed)
+    names, weights = list(mix), list(mix.values())
+    counter = 0
+
+    def next_request():
+        nonlocal counter
+        counter += 1
+        name = rng.choices(names, weights)[0]
+        headers = {'Accept-Encoding': 'gzip, br'}
+        if name == 'home':
+            return name, 'GET', '/', b'', headers
+        if name == 'api':
+            return name, 'GET', '/api/portfolio/', b'', headers
+        body = json.dumps({
+            'name': f'Load {counter}', 'email': 'load@example.com',
+            'subject': 'Load test', 'message': 'Hello ' * rng.randint(5, 100),
+        }).encode()
+        # Each message comes from its own client, as behind the production proxy
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Forwarded-For': f'10.{counter >> 16 & 255}.{counter >> 8 & 255}.{counter & 255}',
+        }
+        return name, 'POST', '/send-message/', body, headers
+
+    return next_request
+
+
+class Command(BaseCommand):
+    help = 'Load-test the site under a locally launched server with a mix of page views, API polls and contact messages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--server', choices=sorted(SERVER_MODULES), default='wsgi',
+                            help="'wsgi' runs the Procfile's gunicorn command")
+        parser.add_argument('--workers', type=int, default=2, help='Server worker processes')
+        parser.add_argument('--duration', type=float, default=10, help='Seconds of load')
+        parser.add_argument('--warmup', type=float, default=1, help='Seconds of load before measuring')
+        parser.add_argument('--concurrency', type=int, default=16, help='Concurrent client connections')
+        parser.add_argument('--mix', default=DEFAULT_MIX, help='Relative weight of each endpoint')
+        parser.add_argument('--projects', type=int, default=50, help='Size of the seeded portfolio')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the request mix')
+        parser.add_argument('--output', help='Write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The load test seeds a throwaway SQLite database; unset DATABASE_URL.')
+        server = options['server']
+        if importlib.util.find_spec(SERVER_MODULES[server]) is None:
+            raise CommandError(f'{SERVER_MODULES[server]} is not installed.')
+        mix = parse_mix(options['mix'])
+
+        with seeded_site(projects=options['projects'], skills=options['projects'] * 5) as env:
+            env.update({
+                'PORTFOLIO_ASYNC_VIEWS': str(server != 'wsgi'),
+                # Trust X-Forwarded-For so each message counts against its own client
+                'PORTFOLIO_PROXY_COUNT': '1',
+            })
+            port = free_port()
+            try:
+                with launch_server(server_command(server, port, options['workers']), port, env=env):
+                    next_request = request_picker(mix, options['seed'])
+                    if options['warmup']:
+                        asyncio.run(run_load(port, next_request, options['warmup'], options['concurrency']))
+                    result = asyncio.run(run_load(port, next_request, options['duration'], options['concurrency']))
+            except RuntimeError as e:
+                raise CommandError(str(e))
+
+        summary = result.summary()
+        self.stdout.write(
+            f"{'endpoint':<13} {'requests':>9} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'errors':>7}  statuses"
+        )
+        for name, row in summary.items():
+            statuses = ' '.join(f'{status}:{count}' for status, count in sorted(row['statuses'].items()))
+            self.stdout.write(
+                f"{name:<13} {row['requests']:>9} {row['rps']:>8.0f} {row['p50_ms']:>8.2f} "
+                f"{row['p95_ms']:>8.2f} {row['p99_ms']:>8.2f} {row['error_rate']:>7.1%}  {statuses}"
+            )
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump({
+                    'server': server,
+                    'workers': options['workers'],
+                    'concurrency': options['concurrency'],
+                    'duration': result.elapsed,
+                    'mix': mix,
+                    'endpoints': summary,
+                }, f, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.images import IMAGE_FIELDS, refresh_variant_urls
+from portfolio.media import URL_FIELDS, update_url
+
+
+class Command(BaseCommand):
+    help = 'Resolve the stored media URLs again, e.g. after changing MEDIA_URL or the storage backend'
+
+    def handle(self, *args, **options):
+        models = {}
+        for model, file_field, url_field in URL_FIELDS:
+            models.setdefault(model, {'urls': [], 'variants': None})['urls'].append((file_field, url_field))
+        for model, image_field, variants_field in IMAGE_FIELDS:
+            models[model]['variants'] = (image_field, variants_field)
+
+        for model, fields in models.items():
+            updated = 0
+            for obj in model.objects.all():
+                changed = [url_field for file_field, url_field in fields['urls'] if update_url(obj, file_field, url_field)]
+                if fields['variants']:
+                    image_field, variants_field = fields['variants']
+                    storage = model._meta.get_field(image_field).storage
+                    variants = refresh_variant_urls(storage, getattr(obj, variants_field))
+                    if variants != (getattr(obj, variants_field) or {}):
+                        setattr(obj, variants_field, variants)
+                        changed.append(variants_field)
+                if changed:
+                    # Saving bumps the content version, so cached pages pick up the new URLs;
+                    # auto_now only stamps updated_at when it is listed, and Last-Modified reads it
+                    obj.save(update_fields=[*changed, 'updated_at'])
+                    updated += 1
+            self.stdout.write(f'{model._meta.verbose_name_plural}: {updated} updated')
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from portfolio.seeding import seed_portfolio
+
+
+class Command(BaseCommand):
+    help = 'Replace all portfolio data with a deterministic synthetic dataset of the given size'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--projects', type=int, default=200)
+        parser.add_argument('--tags-per-project', type=int, default=4)
+        parser.add_argument('--skills', type=int, default=2000)
+        parser.add_argument('--categories', type=int, default=8, help='Skill and certificate categories')
+        parser.add_argument('--achievements', type=int, help='Defaults to --projects')
+        parser.add_argument('--certificates', type=int, help='Defaults to --projects')
+        parser.add_argument('--gallery', type=int, help='Defaults to --projects')
+        parser.add_argument('--messages', type=int, default=10000, help='Contact messages')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--no-images', action='store_true', help='Skip drawing placeholder images')
+        parser.add_argument('--noinput', '--no-input', action='store_false', dest='interactive')
+
+    def handle(self, *args, **options):
+        if options['interactive']:
+            confirm = input(
+                'This deletes every profile, project, skill and contact message in the database.\n'
+                "Type 'yes' to continue, or 'no' to cancel: "
+            )
+            if confirm != 'yes':
+                raise CommandError('Seeding cancelled.')
+
+        start = time.perf_counter()
+        counts = seed_portfolio(
+            projects=options['projects'],
+            skills=options['skills'],
+            tags_per_project=options['tags_per_project'],
+            categories=options['categories'],
+            achievements=options['achievements'],
+            certificates=options['certificates'],
+            gallery=options['gallery'],
+            messages=options['messages'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            images=not options['no_images'],
+        )
+        for name, count in counts.items():
+            self.stdout.write(f'{name:<24} {count:>10}')
+        self.stdout.write(self.style.SUCCESS(f'Seeded in {time.perf_counter() - start:.1f}s'))
@@ -0,0 +1,31 @@
+import time
+
+from django.core.mail import get_connection
+from django.core.management.base import BaseCommand
+
+from portfolio.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = 'Send queued contact notification emails, retrying failures with backoff'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the outbox once and exit')
+        parser.add_argument('--interval', type=float, default=5, help='Seconds to sleep when the outbox is empty')
+        parser.add_argument('--batch-size', type=int, default=50)
+
+    def handle(self, *args, **options):
+        # One connection is reused for as long as there is work, and closed while idle
+        connection = get_connection()
+        try:
+            while True:
+                sent, failed = deliver_pending(options['batch_size'], connection)
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent}, failed {failed}')
+                    continue
+                connection.close()
+                if options['once']:
+                    return
+                time.sleep(options['interval'])
+        finally:
+            connection.close()
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from portfolio.admission import get_shed_counts
+
+
+class Command(BaseCommand):
+    help = 'Show how many contact-form requests admission control has rejected, per reason'
+
+    def handle(self, *args, **options):
+        counts = get_shed_counts()
+        for reason, count in counts.items():
+            self.stdout.write(f'{reason:<16} {count:>8}')
+        self.stdout.write(f"{'total':<16} {sum(counts.values()):>8}")
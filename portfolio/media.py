@@ -0,0 +1,57 @@
+"""
+Public media URLs resolved once, when the file is saved.
+
+Asking the storage backend for a file's URL is not free: Cloudinary builds
+each URL string from its configuration on every call. Each file field shown
+on the site has a URL column next to it, filled in by a pre_save handler,
+and image derivatives record their URLs when they are generated (see
+images.py). The snapshot, the section API and the templates read those
+plain strings and never call the storage backend.
+
+Run `manage.py refresh_media_urls` after changing MEDIA_URL or the storage
+backend.
+"""
+from .models import Profile, Project, Certificate, GalleryImage
+
+# (model, file field, URL field)
+URL_FIELDS = (
+    (Profile, 'profile_image', 'profile_image_url'),
+    (Profile, 'resume', 'resume_url'),
+    (Project, 'image', 'image_url'),
+    (Certificate, 'certificate_file', 'certificate_file_url'),
+    (GalleryImage, 'image', 'image_url'),
+)
+
+
+def storage_url(storage, name):
+    """
+    Public URL of a stored file name, the way media_url resolves a FieldFile.
+    Cloudinary can store full URLs; those are returned directly.
+    """
+    if not name:
+        return ''
+    if name.startswith('http://') or name.startswith('https://'):
+        return name
+    return storage.url(name)
+
+
+def update_url(instance, file_field, url_field):
+    """Resolve the file's URL into the URL field; returns True if it changed"""
+    field_file = getattr(instance, file_field)
+    if field_file and not field_file._committed:
+        # Store the upload now (FileField.pre_save would do it next) so it has its final name
+        field_file.save(field_file.name, field_file.file, save=False)
+    url = storage_url(field_file.storage, field_file.name if field_file else '')
+    if url == getattr(instance, url_field):
+        return False
+    setattr(instance, url_field, url)
+    return True
+
+
+def media_saving(sender, instance, update_fields=None, raw=False, **kwargs):
+    """pre_save handler keeping the URL fields in step with the file fields"""
+    if raw:
+        return
+    for model, file_field, url_field in URL_FIELDS:
+        if sender is model and (update_fields is None or file_field in update_fields):
+            update_url(instance, file_field, url_field)
@@ -0,0 +1,87 @@
+"""
+Full-text index over contact messages, maintained by the database itself.
+
+SQLite: an external-content FTS5 table kept in sync by triggers.
+PostgreSQL: a stored generated tsvector column with a GIN index.
+Other backends get nothing and portfolio.search falls back to icontains.
+"""
+from django.db import migrations
+
+SQLITE_FORWARDS = (
+    """
+    CREATE VIRTUAL TABLE portfolio_contactmessage_fts USING fts5(
+        name, email, subject, message,
+        content='portfolio_contactmessage', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER portfolio_contactmessage_fts_insert AFTER INSERT ON portfolio_contactmessage BEGIN
+        INSERT INTO portfolio_contactmessage_fts(rowid, name, email, subject, message)
+        VALUES (new.id, new.name, new.email, new.subject, new.message);
+    END
+    """,
+    """
+    CREATE TRIGGER portfolio_contactmessage_fts_delete AFTER DELETE ON portfolio_contactmessage BEGIN
+        INSERT INTO portfolio_contactmessage_fts(portfolio_contactmessage_fts, rowid, name, email, subject, message)
+        VALUES ('delete', old.id, old.name, old.email, old.subject, old.message);
+    END
+    """,
+    # Marking a message read must not rewrite its index entry
+    """
+    CREATE TRIGGER portfolio_contactmessage_fts_update
+    AFTER UPDATE OF name, email, subject, message ON portfolio_contactmessage BEGIN
+        INSERT INTO portfolio_contactmessage_fts(portfolio_contactmessage_fts, rowid, name, email, subject, message)
+        VALUES ('delete', old.id, old.name, old.email, old.subject, old.message);
+        INSERT INTO portfolio_contactmessage_fts(rowid, name, email, subject, message)
+        VALUES (new.id, new.name, new.email, new.subject, new.message);
+    END
+    """,
+    "INSERT INTO portfolio_contactmessage_fts(portfolio_contactmessage_fts) VALUES ('rebuild')",
+)
+
+SQLITE_BACKWARDS = (
+    'DROP TRIGGER IF EXISTS portfolio_contactmessage_fts_update',
+    'DROP TRIGGER IF EXISTS portfolio_contactmessage_fts_delete',
+    'DROP TRIGGER IF EXISTS portfolio_contactmessage_fts_insert',
+    'DROP TABLE IF EXISTS portfolio_contactmessage_fts',
+)
+
+# Sender fields are not stemmed; the email is split on its punctuation so
+# "jane", "example" and "jane@example.com" all find it
+POSTGRESQL_FORWARDS = (
+    """
+    ALTER TABLE portfolio_contactmessage ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(name, '') || ' ' || translate(coalesce(email, ''), '@.+-', '    ')), 'A')
+        || setweight(to_tsvector('english', coalesce(subject, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(message, '')), 'C')
+    ) STORED
+    """,
+    'CREATE INDEX portfolio_contactmessage_search ON portfolio_contactmessage USING GIN (search_vector)',
+)
+
+POSTGRESQL_BACKWARDS = (
+    'DROP INDEX IF EXISTS portfolio_contactmessage_search',
+    'ALTER TABLE portfolio_contactmessage DROP COLUMN IF EXISTS search_vector',
+)
+
+
+def run_for_vendor(statements):
+    def run(apps, schema_editor):
+        for sql in statements.get(schema_editor.connection.vendor, ()):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0004_image_variants'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor({'sqlite': SQLITE_FORWARDS, 'postgresql': POSTGRESQL_FORWARDS}),
+            run_for_vendor({'sqlite': SQLITE_BACKWARDS, 'postgresql': POSTGRESQL_BACKWARDS}),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0005_contact_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='achievement',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='achievement_active_order'),
+        ),
+        migrations.AddIndex(
+            model_name='certificate',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='certificate_active_order'),
+        ),
+        migrations.AddIndex(
+            model_name='certificatecategory',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='certcategory_active_order'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['-created_at', '-id'], name='contactmessage_created'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['is_read', '-created_at', '-id'], name='contactmessage_read_created'),
+        ),
+        migrations.AddIndex(
+            model_name='education',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='education_active_order'),
+        ),
+        migrations.AddIndex(
+            model_name='galleryimage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='galleryimage_active_order'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='project_active_order'),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='skill_active_order'),
+        ),
+        migrations.AddIndex(
+            model_name='skillcategory',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='skillcategory_active_order'),
+        ),
+        migrations.AddIndex(
+            model_name='typingtext',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['order', 'id'], name='typingtext_active_order'),
+        ),
+    ]
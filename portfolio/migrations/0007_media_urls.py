@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:56
+
+from django.db import migrations, models
+
+URL_FIELDS = (
+    ('Profile', 'profile_image', 'profile_image_url'),
+    ('Profile', 'resume', 'resume_url'),
+    ('Project', 'image', 'image_url'),
+    ('Certificate', 'certificate_file', 'certificate_file_url'),
+    ('GalleryImage', 'image', 'image_url'),
+)
+
+VARIANT_FIELDS = (
+    ('Profile', 'profile_image', 'profile_image_variants'),
+    ('Project', 'image', 'image_variants'),
+    ('GalleryImage', 'image', 'image_variants'),
+)
+
+
+def resolve_urls(apps, schema_editor):
+    """Fill in the URLs of the files and derivatives stored so far"""
+    for model_name, file_field, url_field in URL_FIELDS:
+        model = apps.get_model('portfolio', model_name)
+        storage = model._meta.get_field(file_field).storage
+        for pk, name in model.objects.exclude(**{file_field: ''}).values_list('pk', file_field):
+            if name:
+                url = name if name.startswith(('http://', 'https://')) else storage.url(name)
+                model.objects.filter(pk=pk).update(**{url_field: url})
+
+    for model_name, image_field, variants_field in VARIANT_FIELDS:
+        model = apps.get_model('portfolio', model_name)
+        storage = model._meta.get_field(image_field).storage
+        for pk, variants in model.objects.values_list('pk', variants_field):
+            if not variants:
+                continue
+            for key in ('webp', 'jpeg'):
+                if variants.get(key):
+                    variants[key] = [[entry[0], entry[1], storage.url(entry[1])] for entry in variants[key]]
+            model.objects.filter(pk=pk).update(**{variants_field: variants})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0006_listing_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='certificate',
+            name='certificate_file_url',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_url',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='profile_image_url',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='resume_url',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_url',
+            field=models.CharField(blank=True, editable=False, max_length=500),
+        ),
+        migrations.RunPython(resolve_urls, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('portfolio', '0007_media_urls'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ShedCount',
+            fields=[
+                ('reason', models.CharField(max_length=20, primary_key=True, serialize=False)),
+                ('count', models.PositiveBigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Shed Count',
+                'verbose_name_plural': 'Shed Counts',
+            },
+        ),
+    ]
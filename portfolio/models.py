@@ -1,6 +1,9 @@
 from django.db import models
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from .cache import get_model_version
+
 
 class Profile(models.Model):
     """Main profile information - only one instance should exist"""
@@ -11,7 +14,10 @@ class Profile(models.Model):
     about_text_2 = models.TextField(help_text="Second paragraph of about section")
     about_text_3 = models.TextField(help_text="Third paragraph of about section")
     profile_image = models.ImageField(upload_to='profile/', blank=True, null=True)
+    profile_image_url = models.CharField(max_length=500, blank=True, editable=False)
+    profile_image_variants = models.JSONField(default=dict, blank=True, editable=False)
     resume = models.FileField(upload_to='resume/', blank=True, null=True)
+    resume_url = models.CharField(max_length=500, blank=True, editable=False)
     email = models.EmailField()
     location = models.CharField(max_length=200)
     
@@ -27,19 +33,41 @@ class Profile(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # (model version, profile) last loaded by get_solo() in this process
+    _solo = None
+
     class Meta:
         verbose_name = "Profile"
         verbose_name_plural = "Profile"
 
     def __str__(self):
         return self.name
-    
+
+    @classmethod
+    def get_solo(cls):
+        """
+        The profile, or None if there is none yet.
+        Kept in process memory until the Profile model version is bumped (see
+        cache.py), so a warm worker reads it without a query. Treat it as read-only.
+        """
+        # Read the version first, so an edit racing the query is picked up next time
+        version = get_model_version(cls._meta.label)
+        solo = Profile._solo
+        if solo is None or solo[0] != version:
+            solo = Profile._solo = (version, cls.objects.order_by('pk').first())
+        return solo[1]
+
     def save(self, *args, **kwargs):
         # Ensure only one profile exists
-        if not self.pk and Profile.objects.exists():
-            existing = Profile.objects.first()
-            self.pk = existing.pk
+        if not self.pk:
+            existing = Profile.get_solo()
+            if existing is not None:
+                # Overwrite it; the UPDATE does not fill auto_now_add
+                self.pk = existing.pk
+                self.created_at = existing.created_at
         super().save(*args, **kwargs)
+        # Other processes reload once the version is bumped on commit
+        Profile._solo = None
 
 
 class Education(models.Model):
@@ -50,11 +78,15 @@ class Education(models.Model):
     grade = models.CharField(max_length=50, help_text="CGPA or Percentage")
     order = models.IntegerField(default=0, help_text="Display order (lower = first)")
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Education"
         verbose_name_plural = "Education"
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id'], condition=models.Q(is_active=True), name='education_active_order'),
+        ]
 
     def __str__(self):
         return f"{self.degree} - {self.institution}"
@@ -66,11 +98,15 @@ class SkillCategory(models.Model):
     icon_class = models.CharField(max_length=100, help_text="FontAwesome icon class, e.g., 'fas fa-laptop-code'")
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Skill Category"
         verbose_name_plural = "Skill Categories"
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id'], condition=models.Q(is_active=True), name='skillcategory_active_order'),
+        ]
 
     def __str__(self):
         return self.name
@@ -87,9 +123,13 @@ class Skill(models.Model):
     )
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id'], condition=models.Q(is_active=True), name='skill_active_order'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.category.name})"
@@ -101,14 +141,20 @@ class Project(models.Model):
     emoji = models.CharField(max_length=10, blank=True, help_text="Emoji for the title, e.g., ✈️")
     description = models.TextField()
     image = models.ImageField(upload_to='projects/')
+    image_url = models.CharField(max_length=500, blank=True, editable=False)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     github_url = models.URLField(blank=True)
     live_url = models.URLField(blank=True)
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id'], condition=models.Q(is_active=True), name='project_active_order'),
+        ]
 
     def __str__(self):
         return self.title
@@ -118,6 +164,7 @@ class ProjectTag(models.Model):
     """Tags for projects like Flask, Python, etc."""
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='tags')
     name = models.CharField(max_length=50)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.name} ({self.project.title})"
@@ -131,9 +178,13 @@ class Achievement(models.Model):
     icon_class = models.CharField(max_length=100, default='fas fa-trophy', help_text="FontAwesome icon class")
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id'], condition=models.Q(is_active=True), name='achievement_active_order'),
+        ]
 
     def __str__(self):
         return self.title
@@ -144,11 +195,15 @@ class CertificateCategory(models.Model):
     name = models.CharField(max_length=100)
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         verbose_name = "Certificate Category"
         verbose_name_plural = "Certificate Categories"
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id'], condition=models.Q(is_active=True), name='certcategory_active_order'),
+        ]
 
     def __str__(self):
         return self.name
@@ -162,17 +217,25 @@ class Certificate(models.Model):
     description = models.CharField(max_length=200, blank=True, help_text="e.g., AI-900 or Machine Learning")
     icon_class = models.CharField(max_length=100, default='fas fa-certificate', help_text="FontAwesome icon class")
     certificate_file = models.FileField(upload_to='certificates/', blank=True, null=True)
+    certificate_file_url = models.CharField(max_length=500, blank=True, editable=False)
     certificate_url = models.URLField(blank=True, help_text="External URL if no file uploaded")
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id'], condition=models.Q(is_active=True), name='certificate_active_order'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.issuer}"
     
     def get_certificate_link(self):
+        # Resolved when the certificate was saved (see media.py)
+        if self.certificate_file_url:
+            return self.certificate_file_url
         if self.certificate_file:
             # Handle both FileField and direct URL strings (Cloudinary)
             str_value = str(self.certificate_file)
@@ -189,12 +252,18 @@ class GalleryImage(models.Model):
     title = models.CharField(max_length=200)
     subtitle = models.CharField(max_length=200, blank=True)
     image = models.ImageField(upload_to='gallery/')
+    image_url = models.CharField(max_length=500, blank=True, editable=False)
+    image_variants = models.JSONField(default=dict, blank=True, editable=False)
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id'], condition=models.Q(is_active=True), name='galleryimage_active_order'),
+        ]
 
     def __str__(self):
         return self.title
@@ -211,21 +280,71 @@ class ContactMessage(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='contactmessage_created'),
+            models.Index(fields=['is_read', '-created_at', '-id'], name='contactmessage_read_created'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.subject}"
 
 
+class EmailOutbox(models.Model):
+    """Pending email notifications for contact messages, sent by a background worker"""
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    message = models.ForeignKey(ContactMessage, on_delete=models.CASCADE, related_name='outbox')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Not retried before this time")
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['next_attempt_at']
+        indexes = [models.Index(fields=['status', 'next_attempt_at'])]
+        verbose_name = "Email Outbox"
+        verbose_name_plural = "Email Outbox"
+
+    def __str__(self):
+        return f"{self.message} ({self.status})"
+
+
 class TypingText(models.Model):
     """Typing animation texts"""
     text = models.CharField(max_length=200)
     order = models.IntegerField(default=0)
     is_active = models.BooleanField(default=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['order']
+        indexes = [
+            models.Index(fields=['order', 'id'], condition=models.Q(is_active=True), name='typingtext_active_order'),
+        ]
         verbose_name = "Typing Text"
         verbose_name_plural = "Typing Texts"
 
     def __str__(self):
         return self.text
+
+
+class ShedCount(models.Model):
+    """Contact-form requests rejected by admission control, per reason (see admission.py)"""
+    reason = models.CharField(max_length=20, primary_key=True)
+    count = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Shed Count"
+        verbose_name_plural = "Shed Counts"
+
+    def __str__(self):
+        return f"{self.reason}: {self.count}"
@@ -0,0 +1,220 @@
+"""
+Durable email notifications for contact messages.
+
+The contact view only writes a ContactMessage and an EmailOutbox row in one
+transaction (through the SQLite writer queue when enabled, see writer.py).
+Delivery happens outside the request: `manage.py send_outbox` drains the
+outbox with retries and exponential backoff over one reused connection,
+and with PORTFOLIO_OUTBOX_IN_PROCESS on, a thread in the web process does
+the same for deploys without a separate worker. That thread starts with
+the process's first request, so rows left pending by a restart are not
+held back until the next contact message.
+
+Rows are claimed by pushing next_attempt_at forward by a lease, so several
+workers never send the same row, and a worker that dies mid-send only
+delays the row until its lease runs out.
+"""
+import asyncio
+import logging
+import threading
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.signals import request_started
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Profile, ContactMessage, EmailOutbox
+from .writer import write_queue
+
+logger = logging.getLogger(__name__)
+
+EMAIL_BODY = """
+New message from your portfolio website!
+
+Name: {name}
+Email: {email}
+Subject: {subject}
+
+Message:
+{message}
+
+---
+Sent from your portfolio contact form
+"""
+
+
+def _insert_contact_message(name, email, subject, message):
+    contact = ContactMessage.objects.create(
+        name=name,
+        email=email,
+        subject=subject,
+        message=message
+    )
+    EmailOutbox.objects.create(message=contact)
+    return contact
+
+
+def enqueue_contact_message(name, email, subject, message):
+    """Save a contact message and queue its notification email"""
+    if settings.PORTFOLIO_WRITER_QUEUE:
+        # Batched with concurrent submissions; returns once committed
+        contact = write_queue.submit(_insert_contact_message, name, email, subject, message)
+    else:
+        contact = _insert_in_transaction(name, email, subject, message)
+    if settings.PORTFOLIO_OUTBOX_IN_PROCESS:
+        transaction.on_commit(wake_worker)
+    return contact
+
+
+def _insert_in_transaction(name, email, subject, message):
+    with transaction.atomic():
+        return _insert_contact_message(name, email, subject, message)
+
+
+async def aenqueue_contact_message(name, email, subject, message):
+    """enqueue_contact_message() for async views"""
+    if settings.PORTFOLIO_WRITER_QUEUE:
+        future = write_queue.enqueue(_insert_contact_message, name, email, subject, message)
+        contact = await asyncio.wait_for(asyncio.wrap_future(future), timeout=30)
+    else:
+        # The async ORM has no transactions, so the pair of inserts runs in a thread
+        contact = await sync_to_async(_insert_in_transaction)(name, email, subject, message)
+    if settings.PORTFOLIO_OUTBOX_IN_PROCESS:
+        wake_worker()
+    return contact
+
+
+def build_email(contact, recipient_email, connection=None):
+    return EmailMessage(
+        subject=f'Portfolio Contact: {contact.subject}',
+        body=EMAIL_BODY.format(
+            name=contact.name, email=contact.email, subject=contact.subject, message=contact.message
+        ),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[recipient_email],
+        connection=connection,
+    )
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2x base, 4x base, ... capped at an hour"""
+    return timedelta(seconds=min(settings.PORTFOLIO_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1), 3600))
+
+
+def claim_batch(limit):
+    """Lease up to `limit` due rows to this worker and return them"""
+    now = timezone.now()
+    lease_until = now + timedelta(seconds=settings.PORTFOLIO_OUTBOX_LEASE)
+    due = list(
+        EmailOutbox.objects.filter(status=EmailOutbox.STATUS_PENDING, next_attempt_at__lte=now)
+        .values_list('pk', flat=True)[:limit]
+    )
+    claimed = []
+    for pk in due:
+        # Only one worker's update can match the row's old next_attempt_at
+        if EmailOutbox.objects.filter(
+            pk=pk, status=EmailOutbox.STATUS_PENDING, next_attempt_at__lte=now
+        ).update(next_attempt_at=lease_until, attempts=F('attempts') + 1):
+            claimed.append(pk)
+    return list(EmailOutbox.objects.filter(pk__in=claimed).select_related('message'))
+
+
+def deliver_pending(limit=50, connection=None):
+    """
+    Send one batch of due notifications.
+    Returns (sent, failed) counts; failed rows are rescheduled or given up on
+    after PORTFOLIO_OUTBOX_MAX_ATTEMPTS.
+    """
+    batch = claim_batch(limit)
+    if not batch:
+        return 0, 0
+
+    profile = Profile.get_solo()
+    recipient_email = profile.email if profile else settings.EMAIL_HOST_USER
+
+    own_connection = connection is None
+    if own_connection:
+        connection = get_connection()
+    sent = failed = 0
+    try:
+        for item in batch:
+            try:
+                # No-op while the connection is open, so it is reused for the batch
+                connection.open()
+                build_email(item.message, recipient_email, connection).send()
+            except Exception as e:
+                failed += 1
+                logger.warning("Email sending failed for outbox %s: %s", item.pk, e)
+                give_up = item.attempts >= settings.PORTFOLIO_OUTBOX_MAX_ATTEMPTS
+                EmailOutbox.objects.filter(pk=item.pk).update(
+                    status=EmailOutbox.STATUS_FAILED if give_up else EmailOutbox.STATUS_PENDING,
+                    next_attempt_at=timezone.now() + retry_delay(item.attempts),
+                    last_error=str(e),
+                )
+                # Start the next message on a fresh connection
+                connection.close()
+            else:
+                sent += 1
+                EmailOutbox.objects.filter(pk=item.pk).update(
+                    status=EmailOutbox.STATUS_SENT, sent_at=timezone.now(), last_error=''
+                )
+    finally:
+        if own_connection:
+            connection.close()
+    return sent, failed
+
+
+def drain(connection=None):
+    """Deliver batches until nothing is due"""
+    total_sent = total_failed = 0
+    while True:
+        sent, failed = deliver_pending(connection=connection)
+        total_sent += sent
+        total_failed += failed
+        if not sent and not failed:
+            return total_sent, total_failed
+
+
+START_WORKER_UID = 'portfolio_outbox_start_worker'
+
+_wake = threading.Event()
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def _run_worker():
+    connection = get_connection()
+    while True:
+        # Drains first, so rows left over from before a restart go out at once
+        close_old_connections()
+        try:
+            drain(connection)
+        except Exception:
+            logger.exception("Outbox worker failed")
+        finally:
+            connection.close()
+            close_old_connections()
+        # Wake up periodically as well, so rescheduled retries are not stuck
+        # waiting for the next contact message
+        _wake.wait(timeout=settings.PORTFOLIO_OUTBOX_POLL_INTERVAL)
+        _wake.clear()
+
+
+def wake_worker():
+    """Start the in-process worker thread if needed and let it drain the outbox"""
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run_worker, name='portfolio-outbox', daemon=True)
+            _worker.start()
+    _wake.set()
+
+
+def start_worker(**kwargs):
+    """request_started receiver starting the in-process worker with the process's first request"""
+    request_started.disconnect(dispatch_uid=START_WORKER_UID)
+    wake_worker()
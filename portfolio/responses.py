@@ -0,0 +1,209 @@
+"""
+Pre-minified, pre-compressed response bodies for the public pages.
+
+A page is rendered, minified and compressed once per content version. The
+result is shared through the cache and kept in process memory, so serving
+it only means picking the body matching the client's Accept-Encoding.
+Until a page is stored, the home view streams it instead (streamed_response).
+"""
+import gzip
+import re
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+
+from .cache import page_cache_key
+
+# In requirements.txt; pages fall back to gzip where it is not installed
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_SIZE = 200
+
+# Preferred order when the client accepts several encodings
+ENCODINGS = ('br', 'gzip')
+
+_preformatted_re = re.compile(r'(<(pre|textarea)\b.*?</\2>)', re.IGNORECASE | re.DOTALL)
+_comment_re = re.compile(r'<!--(?!\[if).*?-->', re.DOTALL)
+
+
+def minify_html(html):
+    """
+    Drop HTML comments, indentation and blank lines.
+    Line breaks are kept so inline scripts relying on them stay valid, and
+    <pre>/<textarea> blocks are left untouched.
+    """
+    parts = _preformatted_re.split(html)
+    out = []
+    # split() with two groups yields: text, block, tag name, text, block, tag name, ...
+    for i in range(0, len(parts), 3):
+        text = _comment_re.sub('', parts[i])
+        out.append('\n'.join(line.strip() for line in text.splitlines() if line.strip()))
+        if i + 1 < len(parts):
+            out.append(parts[i + 1])
+    return ''.join(out)
+
+
+def compress(body):
+    """Return {encoding: bytes} with every encoding that makes the body smaller"""
+    bodies = {'identity': body}
+    if len(body) < MIN_COMPRESS_SIZE:
+        return bodies
+    # mtime=0 keeps the output identical across workers
+    candidates = {'gzip': gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        candidates['br'] = brotli.compress(body)
+    for encoding, compressed in candidates.items():
+        if len(compressed) < len(body):
+            bodies[encoding] = compressed
+    return bodies
+
+
+class StoredResponse(NamedTuple):
+    version: int
+    content_type: str
+    bodies: dict
+
+
+_store = {}
+
+
+def _store_body(version, body, content_type, minify):
+    if minify is not None:
+        body = minify(body)
+    if isinstance(body, str):
+        body = body.encode('utf-8')
+    return StoredResponse(version, content_type, compress(body))
+
+
+def find_stored_response(name, version):
+    """The stored bodies for a page at a content version, or None if it has not been rendered yet"""
+    stored = _store.get(name)
+    if stored is not None and stored.version == version:
+        return stored
+
+    stored = cache.get(page_cache_key(name, version))
+    if stored is not None:
+        _store[name] = stored
+    return stored
+
+
+async def afind_stored_response(name, version):
+    """find_stored_response() for async views"""
+    stored = _store.get(name)
+    if stored is not None and stored.version == version:
+        return stored
+
+    stored = await cache.aget(page_cache_key(name, version))
+    if stored is not None:
+        _store[name] = stored
+    return stored
+
+
+def store_response(name, version, body, content_type, minify=None):
+    """Minify and compress a rendered page and share it through the cache"""
+    stored = _store_body(version, body, content_type, minify)
+    cache.set(page_cache_key(name, version), stored, settings.PORTFOLIO_PAGE_CACHE_TIMEOUT)
+    _store[name] = stored
+    return stored
+
+
+async def astore_response(name, version, body, content_type, minify=None):
+    """store_response() for async views"""
+    stored = _store_body(version, body, content_type, minify)
+    await cache.aset(page_cache_key(name, version), stored, settings.PORTFOLIO_PAGE_CACHE_TIMEOUT)
+    _store[name] = stored
+    return stored
+
+
+def get_stored_response(name, version, render, content_type, minify=None):
+    """
+    Return the stored bodies for a page at a content version.
+    render() is only called when neither this process nor the shared cache has them.
+    """
+    stored = find_stored_response(name, version)
+    if stored is None:
+        stored = store_response(name, version, render(), content_type, minify)
+    return stored
+
+
+async def aget_stored_response(name, version, arender, content_type, minify=None):
+    """get_stored_response() for async views; arender is awaited"""
+    stored = await afind_stored_response(name, version)
+    if stored is None:
+        stored = await astore_response(name, version, await arender(), content_type, minify)
+    return stored
+
+
+def accepted_encodings(header):
+    """Parse Accept-Encoding into {encoding: q-value}"""
+    accepted = {}
+    for item in header.split(','):
+        encoding, _, params = item.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if encoding:
+            accepted[encoding.lower()] = q
+    return accepted
+
+
+def choose_encoding(request, bodies):
+    accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    for encoding in ENCODINGS:
+        # An explicit q=0 refuses the encoding even if "*" is accepted
+        if encoding in bodies and accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return 'identity'
+
+
+def stored_response(request, stored, etag):
+    """Build the response for the best encoding the client accepts"""
+    encoding = choose_encoding(request, stored.bodies)
+    response = HttpResponse(stored.bodies[encoding], content_type=stored.content_type)
+    if len(stored.bodies) > 1:
+        patch_vary_headers(response, ('Accept-Encoding',))
+    if encoding != 'identity':
+        response['Content-Encoding'] = encoding
+        # The compressed bytes differ from the identity body, so the validator
+        # can only be weak; Django still matches it weakly against If-None-Match.
+        etag = f'W/{etag}'
+    response['ETag'] = etag
+    return response
+
+
+async def aiter_chunks(chunks):
+    """
+    Async iterator over a sync one, pulling each chunk in the request's sync
+    thread: an ASGI StreamingHttpResponse would buffer a sync iterator whole.
+    """
+    chunks = iter(chunks)
+    while (chunk := await sync_to_async(next)(chunks, None)) is not None:
+        yield chunk
+
+
+def streamed_response(request, chunks, content_type, etag):
+    """
+    StreamingHttpResponse for a page that is rendered while it is sent. It
+    goes out uncompressed: this only happens until the page is stored, and
+    compressing would hold back the early chunks.
+    """
+    if isinstance(request, ASGIRequest) and not hasattr(chunks, '__aiter__'):
+        chunks = aiter_chunks(chunks)
+    response = StreamingHttpResponse(chunks, content_type=content_type)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    response['ETag'] = etag
+    return response
@@ -0,0 +1,94 @@
+"""
+Full-text search over contact messages.
+
+The index lives in the database (see migration 0005): an FTS5 table on
+SQLite and a GIN-indexed tsvector column on PostgreSQL, both updated by
+the database on every insert, update and delete. A search only reads the
+index entries for its terms instead of scanning every message. Every
+term must match, the last one as a prefix, and matches in the sender and
+subject rank above the body. Only the newest MAX_RANKED matches are
+ranked, so a term found in most of the inbox does not score every row.
+Other backends fall back to icontains.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import ContactMessage
+
+FTS_TABLE = 'portfolio_contactmessage_fts'
+
+# Search terms beyond this are ignored
+MAX_TERMS = 8
+
+# Newest matches considered for ranking
+MAX_RANKED = 5000
+
+# bm25 weights of the FTS5 columns: name, email, subject, message
+_bm25 = f'bm25({FTS_TABLE}, 10.0, 10.0, 5.0, 1.0)'
+
+_term_re = re.compile(r'\w+')
+
+
+def search_terms(query):
+    return _term_re.findall(query.lower())[:MAX_TERMS]
+
+
+def _match(terms):
+    """(id column, FROM clause of the matches, its params, rank score lower is better, its params)"""
+    if connection.vendor == 'sqlite':
+        # Quoted terms keep FTS5 operators typed by the user literal
+        expression = ' '.join(f'"{term}"' for term in terms) + '*'
+        return 'rowid', f'{FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [expression], _bm25, []
+    # The sender weight is indexed with 'simple' and the rest with 'english'
+    # (see migration 0005), so each term matches either form; a stopword
+    # gives an empty english query and still matches names and emails
+    lexemes = terms[:-1] + [terms[-1] + ':*']
+    tsquery = ' && '.join(["(to_tsquery('simple', %s) || to_tsquery('english', %s))"] * len(lexemes))
+    params = [lexeme for lexeme in lexemes for _ in range(2)]
+    return (
+        'id', f'portfolio_contactmessage WHERE search_vector @@ ({tsquery})', params,
+        f'-ts_rank(search_vector, {tsquery})', params,
+    )
+
+
+def has_index():
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def matching_messages(queryset, query):
+    """ContactMessages of queryset matching query, in queryset's own order"""
+    terms = search_terms(query)
+    if not terms:
+        return queryset.none()
+    if not has_index():
+        for term in terms:
+            queryset = queryset.filter(
+                Q(name__icontains=term) | Q(email__icontains=term)
+                | Q(subject__icontains=term) | Q(message__icontains=term)
+            )
+        return queryset
+    id_column, source, params, _, _ = _match(terms)
+    return queryset.filter(pk__in=RawSQL(f'SELECT {id_column} FROM {source}', params))
+
+
+def search_messages(query, limit=20):
+    """The `limit` ContactMessages best matching query, best first"""
+    terms = search_terms(query)
+    if not terms:
+        return []
+    if not has_index():
+        return list(matching_messages(ContactMessage.objects.all(), query)[:limit])
+
+    id_column, source, params, score, score_params = _match(terms)
+    sql = (
+        f'SELECT id FROM (SELECT {id_column} AS id, {score} AS score FROM {source} '
+        f'ORDER BY {id_column} DESC LIMIT %s) AS newest ORDER BY score LIMIT %s'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*score_params, *params, MAX_RANKED, limit])
+        ids = [row[0] for row in cursor.fetchall()]
+    messages = ContactMessage.objects.in_bulk(ids)
+    return [messages[pk] for pk in ids if pk in messages]
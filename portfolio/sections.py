@@ -0,0 +1,165 @@
+"""
+Per-section API: /api/portfolio/<section>/.
+
+Each section is served straight from its table with one values() query
+per page (projects add one for their tags when asked for). ?fields= picks
+the values() columns, ?cursor= continues after the last (order, pk) of the
+previous page and ?limit= sets the page size. Field names match the full
+/api/portfolio/ payload.
+"""
+import base64
+import binascii
+from typing import NamedTuple
+
+from django.db.models import Q
+
+from .images import resolve_variants
+from .models import Education, Skill, Project, ProjectTag, Achievement, Certificate, GalleryImage
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class SectionError(ValueError):
+    """Bad query parameters; the message is returned to the client"""
+
+
+class Section(NamedTuple):
+    model: type
+    # Public field name -> values() lookup, or None for fields added after the query
+    fields: dict
+    filters: Q
+
+
+SECTIONS = {
+    'education': Section(
+        Education,
+        {'degree': 'degree', 'institution': 'institution', 'year_range': 'year_range', 'grade': 'grade'},
+        Q(is_active=True),
+    ),
+    'skills': Section(
+        Skill,
+        {'name': 'name', 'icon': 'icon_class', 'proficiency': 'proficiency', 'category': 'category__name'},
+        Q(is_active=True, category__is_active=True),
+    ),
+    'projects': Section(
+        Project,
+        {
+            'title': 'title', 'emoji': 'emoji', 'description': 'description', 'image': 'image_url',
+            'image_variants': 'image_variants', 'github_url': 'github_url', 'live_url': 'live_url',
+            'tags': None,
+        },
+        Q(is_active=True),
+    ),
+    'achievements': Section(
+        Achievement,
+        {'title': 'title', 'description': 'description', 'date': 'date', 'icon': 'icon_class'},
+        Q(is_active=True),
+    ),
+    'certificates': Section(
+        Certificate,
+        {
+            'title': 'title', 'issuer': 'issuer', 'description': 'description', 'icon': 'icon_class',
+            'category': 'category__name', 'link': None,
+        },
+        Q(is_active=True),
+    ),
+    'gallery': Section(
+        GalleryImage,
+        {'title': 'title', 'subtitle': 'subtitle', 'image': 'image_url', 'image_variants': 'image_variants'},
+        Q(is_active=True),
+    ),
+}
+
+
+def encode_cursor(order, pk):
+    return base64.urlsafe_b64encode(f'{order}.{pk}'.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        order, pk = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode().split('.')
+        return int(order), int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise SectionError('Invalid cursor.')
+
+
+def after_cursor(queryset, order, pk):
+    """Rows after (order, pk) in (order, pk) order"""
+    # order__gte is redundant but gives the planner a range to seek in the
+    # (order, id) index; the OR alone makes it scan from the start
+    return queryset.filter(Q(order__gte=order), Q(order__gt=order) | Q(pk__gt=pk))
+
+
+def parse_fields(section, value):
+    if not value:
+        return list(section.fields)
+    fields = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in section.fields]
+    if unknown:
+        raise SectionError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(section.fields)}.")
+    return fields
+
+
+def parse_limit(value):
+    if not value:
+        return DEFAULT_LIMIT
+    try:
+        limit = int(value)
+    except ValueError:
+        raise SectionError('limit must be a number.')
+    if not 1 <= limit <= MAX_LIMIT:
+        raise SectionError(f'limit must be between 1 and {MAX_LIMIT}.')
+    return limit
+
+
+def section_page(name, params):
+    """
+    One page of a section as {'results': [...], 'next_cursor': str or None}.
+    params is the request's query dict; raises SectionError for bad parameters.
+    """
+    section = SECTIONS[name]
+    fields = parse_fields(section, params.get('fields'))
+    limit = parse_limit(params.get('limit'))
+    model = section.model
+
+    lookups = {section.fields[field] for field in fields if section.fields[field]}
+    if 'link' in fields:
+        lookups |= {'certificate_file_url', 'certificate_url'}
+    queryset = model.objects.filter(section.filters)
+    if name == 'projects' and params.get('tag'):
+        # A subquery rather than a join, so a project never appears twice
+        tagged = ProjectTag.objects.filter(name__iexact=params['tag']).values('project_id')
+        queryset = queryset.filter(pk__in=tagged)
+    if params.get('cursor'):
+        queryset = after_cursor(queryset, *decode_cursor(params['cursor']))
+
+    # One extra row tells whether there is a next page
+    rows = list(queryset.order_by('order', 'pk').values('pk', 'order', *lookups)[:limit + 1])
+    next_cursor = encode_cursor(rows[limit - 1]['order'], rows[limit - 1]['pk']) if len(rows) > limit else None
+    rows = rows[:limit]
+
+    tags = {}
+    if 'tags' in fields and rows:
+        for project_id, tag in ProjectTag.objects.filter(
+            project_id__in=[row['pk'] for row in rows]
+        ).order_by('pk').values_list('project_id', 'name'):
+            tags.setdefault(project_id, []).append(tag)
+
+    results = []
+    for row in rows:
+        item = {}
+        for field in fields:
+            lookup = section.fields[field]
+            if field == 'tags':
+                item[field] = tags.get(row['pk'], [])
+            elif field == 'link':
+                item[field] = row['certificate_file_url'] or row['certificate_url']
+            elif lookup == 'category__name':
+                item[field] = row[lookup] or ''
+            elif field == 'image_variants':
+                item[field] = resolve_variants(model._meta.get_field('image').storage, row[lookup])
+            else:
+                item[field] = row[lookup]
+        results.append(item)
+    return {'results': results, 'next_cursor': next_cursor}
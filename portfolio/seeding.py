@@ -0,0 +1,258 @@
+"""
+Deterministic synthetic portfolio data for profiling and load tests.
+
+seed_portfolio() replaces every portfolio table with generated rows. The
+same seed always produces the same rows. Rows are inserted with batched
+bulk_create, one transaction per batch, so millions of contact messages
+load without one save() per object. bulk_create sends no signals, so the
+content version is bumped once at the end.
+
+A handful of placeholder images per kind are drawn with Pillow (with
+their responsive derivatives) and shared by all rows.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+from itertools import islice
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import connection, transaction
+from django.db.models.fields.files import FieldFile
+from PIL import Image, ImageDraw
+
+from .cache import SECTION_LABELS, bump_content_version
+from .images import FORMATS, generate_variants, variant_name
+from .media import storage_url
+from .models import (
+    Profile, Education, SkillCategory, Skill, Project, ProjectTag, Achievement,
+    CertificateCategory, Certificate, GalleryImage, ContactMessage, EmailOutbox, TypingText
+)
+
+WORDS = (
+    'neural', 'vision', 'graph', 'stream', 'vector', 'query', 'model', 'signal', 'cloud', 'agent',
+    'tensor', 'cache', 'index', 'kernel', 'pixel', 'token', 'matrix', 'sensor', 'engine', 'pipeline',
+)
+ICONS = ('fab fa-python', 'fas fa-brain', 'fas fa-database', 'fab fa-js', 'fas fa-code', 'fab fa-docker')
+COLORS = ('#6c5ce7', '#00b894', '#0984e3', '#e17055', '#fdcb6e', '#d63031', '#2d3436', '#e84393')
+
+# Placeholder images drawn per kind; rows cycle through them
+PLACEHOLDERS = 8
+# Newest seeded contact message; older ones are spread out before it
+MESSAGES_END = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def words(rng, count):
+    return ' '.join(rng.choices(WORDS, k=count))
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def insert(model, objs, batch_size):
+    """bulk_create objs in batches, one transaction each; returns the created objects"""
+    created = []
+    for batch in batches(objs, batch_size):
+        with transaction.atomic():
+            created.extend(model.objects.bulk_create(batch))
+    return created
+
+
+def insert_dated(model, objs):
+    """bulk_create objs, then write back the created_at values auto_now_add replaced with now()"""
+    created_at = [obj.created_at for obj in objs]
+    objs = model.objects.bulk_create(objs)
+    for obj, value in zip(objs, created_at):
+        obj.created_at = value
+    # One UPDATE per row through executemany; bulk_update's CASE expressions
+    # take longer to build than the inserts themselves
+    field, quote = model._meta.get_field('created_at'), connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'UPDATE {quote(model._meta.db_table)} SET {quote(field.column)} = %s WHERE {quote(model._meta.pk.column)} = %s',
+            [(field.get_db_prep_value(obj.created_at, connection), obj.pk) for obj in objs],
+        )
+    return objs
+
+
+def draw_placeholder(rng, size, label):
+    image = Image.new('RGB', size, rng.choice(COLORS))
+    draw = ImageDraw.Draw(image)
+    for _ in range(6):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        radius = rng.randrange(size[1] // 8, size[1] // 2)
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=rng.choice(COLORS))
+    draw.text((20, 20), label, fill='white')
+    buffer = BytesIO()
+    image.save(buffer, 'JPEG', quality=80)
+    return buffer.getvalue()
+
+
+def placeholder_images(model, field_name, rng, seed, count, size):
+    """
+    (name, url, variants) of `count` placeholder images for model.field_name.
+    Files already written by an earlier run with the same seed are reused.
+    """
+    field = model._meta.get_field(field_name)
+    upload_to = field.upload_to.rstrip('/')
+    images = []
+    for i in range(count):
+        name = f'{upload_to}/seed-{seed}-{i}.jpg'
+        content = draw_placeholder(rng, size, f'{model.__name__} {i}')
+        if not field.storage.exists(name):
+            name = field.storage.save(name, ContentFile(content))
+            variants = generate_variants(FieldFile(None, field, name))
+        else:
+            widths = sorted({min(width, size[0]) for width in settings.PORTFOLIO_IMAGE_WIDTHS})
+            variants = {'source': name, 'width': size[0], 'height': size[1]}
+            for key, _, extension in FORMATS:
+                variants[key] = []
+                for width in widths:
+                    variant = variant_name(name, width, extension)
+                    variants[key].append([width, variant, field.storage.url(variant)])
+        images.append((name, storage_url(field.storage, name), variants))
+    return images
+
+
+def outbox_row(message, status):
+    sent = status == EmailOutbox.STATUS_SENT
+    return EmailOutbox(
+        message=message, status=status, attempts=1 if sent else settings.PORTFOLIO_OUTBOX_MAX_ATTEMPTS,
+        next_attempt_at=message.created_at, created_at=message.created_at,
+        sent_at=message.created_at if sent else None, last_error='' if sent else 'Connection refused',
+    )
+
+
+def clear_portfolio():
+    """Delete every portfolio row, children first"""
+    # Raw deletes: the ORM would load every row to cascade and send a
+    # post_delete (and a content version bump) for each one
+    with transaction.atomic(), connection.cursor() as cursor:
+        for model in (
+            EmailOutbox, ContactMessage, ProjectTag, Project, Skill, SkillCategory, Certificate,
+            CertificateCategory, Achievement, Education, GalleryImage, TypingText, Profile,
+        ):
+            cursor.execute(f'DELETE FROM {connection.ops.quote_name(model._meta.db_table)}')
+
+
+def seed_portfolio(
+    projects=50, skills=250, tags_per_project=3, categories=5, achievements=None,
+    certificates=None, gallery=None, messages=0, seed=0, batch_size=1000, images=True,
+):
+    """
+    Replace the portfolio with a generated dataset and return the row count per model.
+    achievements, certificates and gallery default to the number of projects.
+    With images=False, image fields name files that do not exist.
+    """
+    rng = random.Random(seed)
+    achievements = projects if achievements is None else achievements
+    certificates = projects if certificates is None else certificates
+    gallery = projects if gallery is None else gallery
+
+    clear_portfolio()
+
+    if images:
+        profile_images = placeholder_images(Profile, 'profile_image', rng, seed, 1, (800, 800))
+        project_images = placeholder_images(Project, 'image', rng, seed, PLACEHOLDERS, (1200, 800))
+        gallery_images = placeholder_images(GalleryImage, 'image', rng, seed, PLACEHOLDERS, (800, 800))
+    else:
+        profile_images = [('', '', {})]
+        project_images = [(f'projects/{i}.png', default_storage.url(f'projects/{i}.png'), {}) for i in range(PLACEHOLDERS)]
+        gallery_images = [(f'gallery/{i}.jpeg', default_storage.url(f'gallery/{i}.jpeg'), {}) for i in range(PLACEHOLDERS)]
+
+    Profile.objects.create(
+        name='Benchmark', description=words(rng, 20), about_text_1=words(rng, 40),
+        about_text_2=words(rng, 40), about_text_3=words(rng, 40), email='benchmark@example.com',
+        location='Localhost', github_url='https://github.com/example',
+        profile_image=profile_images[0][0], profile_image_variants=profile_images[0][2],
+    )
+    counts = {'profile': 1}
+
+    counts['education'] = len(insert(Education, (
+        Education(degree=f'Degree {i}', institution=words(rng, 2).title(), year_range='2020 - 2024', grade='9.0', order=i)
+        for i in range(3)
+    ), batch_size))
+
+    skill_cats = insert(SkillCategory, (
+        SkillCategory(name=f'Category {i}', icon_class=rng.choice(ICONS), order=i) for i in range(categories)
+    ), batch_size)
+    counts['skill_categories'] = len(skill_cats)
+    counts['skills'] = len(insert(Skill, (
+        Skill(
+            category=skill_cats[i % categories], name=f'Skill {i}', icon_class=rng.choice(ICONS),
+            proficiency=rng.randint(40, 100), order=i,
+        )
+        for i in range(skills)
+    ), batch_size))
+
+    project_objs = insert(Project, (
+        Project(
+            title=f'{words(rng, 2).title()} {i}', description=words(rng, 30),
+            image=project_images[i % len(project_images)][0],
+            image_url=project_images[i % len(project_images)][1],
+            image_variants=project_images[i % len(project_images)][2],
+            github_url=f'https://github.com/example/project-{i}', order=i,
+        )
+        for i in range(projects)
+    ), batch_size)
+    counts['projects'] = len(project_objs)
+    counts['project_tags'] = len(insert(ProjectTag, (
+        ProjectTag(project=p, name=rng.choice(WORDS).title()) for p in project_objs for _ in range(tags_per_project)
+    ), batch_size))
+
+    counts['achievements'] = len(insert(Achievement, (
+        Achievement(title=f'Achievement {i}', description=words(rng, 15), date=str(2020 + i % 6), order=i)
+        for i in range(achievements)
+    ), batch_size))
+
+    cert_cats = insert(CertificateCategory, (
+        CertificateCategory(name=f'Issuer {i}', order=i) for i in range(categories)
+    ), batch_size)
+    counts['certificate_categories'] = len(cert_cats)
+    counts['certificates'] = len(insert(Certificate, (
+        Certificate(
+            category=cert_cats[i % categories], title=f'Certificate {i}', issuer=f'Issuer {i % categories}',
+            description=words(rng, 3), certificate_url=f'https://example.com/certificates/{i}', order=i,
+        )
+        for i in range(certificates)
+    ), batch_size))
+
+    counts['gallery'] = len(insert(GalleryImage, (
+        GalleryImage(
+            title=f'Moment {i}', subtitle=words(rng, 3),
+            image=gallery_images[i % len(gallery_images)][0],
+            image_url=gallery_images[i % len(gallery_images)][1],
+            image_variants=gallery_images[i % len(gallery_images)][2], order=i,
+        )
+        for i in range(gallery)
+    ), batch_size))
+
+    counts['typing_texts'] = len(insert(TypingText, (
+        TypingText(text=words(rng, 2).title(), order=i) for i in range(5)
+    ), batch_size))
+
+    counts['contact_messages'] = 0
+    # Nothing is left pending, so an outbox worker never emails seeded messages
+    statuses = (EmailOutbox.STATUS_SENT,) * 19 + (EmailOutbox.STATUS_FAILED,)
+    contacts = (
+        ContactMessage(
+            name=f'Sender {i}', email=f'sender{i}@example.com', subject=words(rng, 4).capitalize(),
+            message=words(rng, rng.randint(10, 80)), is_read=rng.random() < 0.7,
+            # One message every ~10 minutes, oldest first
+            created_at=MESSAGES_END - timedelta(seconds=(messages - i) * 600 - rng.randrange(600)),
+        )
+        for i in range(messages)
+    )
+    for batch in batches(contacts, batch_size):
+        with transaction.atomic():
+            batch = insert_dated(ContactMessage, batch)
+            insert_dated(EmailOutbox, [outbox_row(m, rng.choice(statuses)) for m in batch])
+        counts['contact_messages'] += len(batch)
+
+    # bulk_create does not send post_save
+    bump_content_version(*SECTION_LABELS)
+    return counts
@@ -0,0 +1,107 @@
+"""
+Serialization of the portfolio snapshot for the JSON API.
+
+The payload is built from the in-memory snapshot and encoded once per
+content version (see responses.py). The encoder is a plain callable that
+turns a dict into bytes; set PORTFOLIO_JSON_ENCODER to the dotted path of
+another one (for example 'portfolio.serializers.orjson_encoder') to swap it.
+"""
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+
+def json_encoder(data):
+    """Compact UTF-8 JSON using the standard library"""
+    return json.dumps(data, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def orjson_encoder(data):
+    """Faster encoder, requires the optional orjson package"""
+    import orjson
+    return orjson.dumps(data)
+
+
+def get_encoder():
+    return import_string(settings.PORTFOLIO_JSON_ENCODER)
+
+
+def serialize_profile(profile):
+    if profile is None:
+        return None
+    return {
+        'name': profile.name,
+        'tagline': profile.tagline,
+        'description': profile.description,
+        'email': profile.email,
+        'location': profile.location,
+        'github_url': profile.github_url,
+        'linkedin_url': profile.linkedin_url,
+        'leetcode_url': profile.leetcode_url,
+        'hackerrank_url': profile.hackerrank_url,
+    }
+
+
+def serialize_portfolio(snapshot):
+    """Build the /api/portfolio/ payload from a snapshot"""
+    return {
+        'profile': serialize_profile(snapshot.profile),
+        'skills': [
+            {
+                'category': cat.name,
+                'icon': cat.icon_class,
+                'skills': [
+                    {'name': s.name, 'icon': s.icon_class, 'proficiency': s.proficiency}
+                    for s in cat.skills
+                ]
+            }
+            for cat in snapshot.skill_categories
+        ],
+        'projects': [
+            {
+                'title': p.title,
+                'emoji': p.emoji,
+                'description': p.description,
+                'image': p.image,
+                'github_url': p.github_url,
+                'live_url': p.live_url,
+                'tags': list(p.tags)
+            }
+            for p in snapshot.projects
+        ],
+        'achievements': [
+            {
+                'title': a.title,
+                'description': a.description,
+                'date': a.date,
+                'icon': a.icon_class
+            }
+            for a in snapshot.achievements
+        ],
+        'certificates': [
+            {
+                'title': c.title,
+                'issuer': c.issuer,
+                'description': c.description,
+                'icon': c.icon_class,
+                'link': c.link
+            }
+            for c in snapshot.certificates
+        ],
+        'gallery': [
+            {
+                'title': g.title,
+                'subtitle': g.subtitle,
+                'image': g.image
+            }
+            for g in snapshot.gallery
+        ]
+    }
+
+
+def encode_portfolio(snapshot, encoder=None):
+    encoder = encoder or get_encoder()
+    return encoder(serialize_portfolio(snapshot))
+
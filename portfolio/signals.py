@@ -0,0 +1,41 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+
+from .cache import bump_content_version
+from .images import IMAGE_FIELDS, image_deleted, image_saving
+from .media import URL_FIELDS, media_saving
+from .outbox import START_WORKER_UID, start_worker
+from .models import (
+    Profile, Education, SkillCategory, Skill, Project, ProjectTag,
+    Achievement, CertificateCategory, Certificate, GalleryImage, TypingText
+)
+
+# Models whose content is shown on the public pages
+CONTENT_MODELS = (
+    Profile, Education, SkillCategory, Skill, Project, ProjectTag,
+    Achievement, CertificateCategory, Certificate, GalleryImage, TypingText,
+)
+
+
+def content_changed(sender, **kwargs):
+    """Bump the content and model versions once the change is visible to other connections"""
+    # Bumping before commit would let a concurrent request cache the old
+    # rows under the new version.
+    transaction.on_commit(partial(bump_content_version, sender._meta.label))
+
+
+def connect_signals():
+    if settings.PORTFOLIO_OUTBOX_IN_PROCESS:
+        request_started.connect(start_worker, dispatch_uid=START_WORKER_UID)
+    for model in CONTENT_MODELS:
+        post_save.connect(content_changed, sender=model, dispatch_uid=f'content_saved_{model.__name__}')
+        post_delete.connect(content_changed, sender=model, dispatch_uid=f'content_deleted_{model.__name__}')
+    for model, _, _ in IMAGE_FIELDS:
+        pre_save.connect(image_saving, sender=model, dispatch_uid=f'image_saving_{model.__name__}')
+        post_delete.connect(image_deleted, sender=model, dispatch_uid=f'image_deleted_{model.__name__}')
+    for model in {model for model, _, _ in URL_FIELDS}:
+        pre_save.connect(media_saving, sender=model, dispatch_uid=f'media_saving_{model.__name__}')
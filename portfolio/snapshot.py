@@ -0,0 +1,374 @@
+"""
+Read model for the public portfolio pages.
+
+A PortfolioSnapshot holds everything the home page, the JSON API and the
+context processor need, as immutable records instead of model instances.
+It is built once per content version and kept in process memory, so a warm
+worker answers without running any SQL.
+"""
+import threading
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .cache import (
+    get_content_version, get_content_changed_at, get_section_versions,
+    aget_content_version, aget_content_changed_at, aget_section_versions,
+)
+from .images import resolve_variants
+from .models import (
+    Profile, Education, SkillCategory, Skill, Project, ProjectTag,
+    Achievement, Certificate, GalleryImage, TypingText
+)
+from .timing import phase
+
+
+class ProfileRecord(NamedTuple):
+    name: str
+    tagline: str
+    description: str
+    about_text_1: str
+    about_text_2: str
+    about_text_3: str
+    profile_image: str
+    profile_image_variants: dict
+    resume: str
+    email: str
+    location: str
+    github_url: str
+    linkedin_url: str
+    leetcode_url: str
+    hackerrank_url: str
+    cups_of_coffee: int
+    updated_at: datetime
+
+
+class EducationRecord(NamedTuple):
+    degree: str
+    institution: str
+    year_range: str
+    grade: str
+
+
+class SkillRecord(NamedTuple):
+    name: str
+    icon_class: str
+    proficiency: int
+
+
+class SkillCategoryRecord(NamedTuple):
+    name: str
+    icon_class: str
+    skills: tuple
+
+
+class ProjectRecord(NamedTuple):
+    title: str
+    emoji: str
+    description: str
+    image: str
+    image_variants: dict
+    github_url: str
+    live_url: str
+    tags: tuple
+
+
+class AchievementRecord(NamedTuple):
+    title: str
+    description: str
+    date: str
+    icon_class: str
+
+
+class CertificateRecord(NamedTuple):
+    title: str
+    issuer: str
+    description: str
+    icon_class: str
+    category: str
+    link: str
+
+
+class GalleryImageRecord(NamedTuple):
+    title: str
+    subtitle: str
+    image: str
+    image_variants: dict
+
+
+class Stats(NamedTuple):
+    projects: int
+    achievements: int
+    certificates: int
+    coffee: int
+
+
+class PortfolioSnapshot(NamedTuple):
+    version: int
+    profile: Optional[ProfileRecord]
+    education: tuple
+    skill_categories: tuple
+    projects: tuple
+    achievements: tuple
+    certificates: tuple
+    gallery: tuple
+    typing_texts: tuple
+    stats: Stats
+    last_modified: Optional[datetime]
+    # Fragment cache versions of the page sections, read before the rows
+    section_versions: dict
+
+
+PROFILE_FIELDS = (
+    'name', 'tagline', 'description', 'about_text_1', 'about_text_2', 'about_text_3',
+    'profile_image_url', 'profile_image_variants', 'resume_url', 'email', 'location', 'github_url', 'linkedin_url',
+    'leetcode_url', 'hackerrank_url', 'cups_of_coffee', 'updated_at',
+)
+
+
+def image_variants(model, field_name, variants):
+    """An image's derivatives with URLs resolved, for the responsive_image tag"""
+    with phase('media'):
+        return resolve_variants(model._meta.get_field(field_name).storage, variants)
+
+
+def _profile_record(row):
+    if row is None:
+        return None
+    # File URLs are resolved when the files are saved (see media.py)
+    row['profile_image'] = row.pop('profile_image_url')
+    row['profile_image_variants'] = image_variants(Profile, 'profile_image', row['profile_image_variants'])
+    row['resume'] = row.pop('resume_url')
+    return ProfileRecord(**row)
+
+
+def _group_by(rows, key):
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.pop(key), []).append(row)
+    return groups
+
+
+def _pop_stamps(rows, timestamps, stamp_fields=('updated_at',)):
+    """Move each row's change timestamps into timestamps"""
+    for row in rows:
+        timestamps.extend(row.pop(field) for field in stamp_fields)
+    return rows
+
+
+def snapshot_querysets():
+    """
+    The fixed set of values() queries a snapshot is built from.
+    Children are grouped by foreign key in Python, so the query count does
+    not grow with the number of projects or skills.
+    """
+    return {
+        'profile': Profile.objects.order_by('pk').values(*PROFILE_FIELDS)[:1],
+        'education': Education.objects.filter(is_active=True).values(*EducationRecord._fields, 'updated_at'),
+        'skill_categories': SkillCategory.objects.filter(is_active=True).values('id', 'name', 'icon_class', 'updated_at'),
+        'skills': Skill.objects.filter(is_active=True, category__is_active=True).values(
+            'category_id', *SkillRecord._fields, 'updated_at'
+        ),
+        'projects': Project.objects.filter(is_active=True).values(
+            'id', 'title', 'emoji', 'description', 'image_url', 'image_variants', 'github_url', 'live_url', 'updated_at'
+        ),
+        'tags': ProjectTag.objects.filter(project__is_active=True).order_by('pk').values('project_id', 'name', 'updated_at'),
+        'achievements': Achievement.objects.filter(is_active=True).values(*AchievementRecord._fields, 'updated_at'),
+        'certificates': Certificate.objects.filter(is_active=True).values(
+            'title', 'issuer', 'description', 'icon_class', 'category__name',
+            'certificate_file_url', 'certificate_url', 'updated_at', 'category__updated_at',
+        ),
+        'gallery': GalleryImage.objects.filter(is_active=True).values('title', 'subtitle', 'image_url', 'image_variants', 'updated_at'),
+        'typing_texts': TypingText.objects.filter(is_active=True).values('text', 'updated_at'),
+    }
+
+
+def assemble_snapshot(version, rows, changed_at, section_versions):
+    """Turn the rows fetched for snapshot_querysets() into a PortfolioSnapshot"""
+    timestamps = []
+    profile_rows = rows['profile']
+    if profile_rows:
+        timestamps.append(profile_rows[0]['updated_at'])
+    profile = _profile_record(profile_rows[0] if profile_rows else None)
+
+    education = tuple(EducationRecord(**row) for row in _pop_stamps(rows['education'], timestamps))
+
+    skills = _group_by(_pop_stamps(rows['skills'], timestamps), 'category_id')
+    skill_categories = tuple(
+        SkillCategoryRecord(
+            row['name'],
+            row['icon_class'],
+            tuple(SkillRecord(**s) for s in skills.get(row['id'], ())),
+        )
+        for row in _pop_stamps(rows['skill_categories'], timestamps)
+    )
+
+    tags = _group_by(_pop_stamps(rows['tags'], timestamps), 'project_id')
+    projects = tuple(
+        ProjectRecord(
+            row['title'], row['emoji'], row['description'],
+            row['image_url'],
+            image_variants(Project, 'image', row['image_variants']),
+            row['github_url'], row['live_url'],
+            tuple(t['name'] for t in tags.get(row['id'], ())),
+        )
+        for row in _pop_stamps(rows['projects'], timestamps)
+    )
+
+    achievements = tuple(AchievementRecord(**row) for row in _pop_stamps(rows['achievements'], timestamps))
+
+    certificates = tuple(
+        CertificateRecord(
+            row['title'], row['issuer'], row['description'], row['icon_class'],
+            row['category__name'] or '',
+            row['certificate_file_url'] or row['certificate_url'],
+        )
+        for row in _pop_stamps(rows['certificates'], timestamps, ('updated_at', 'category__updated_at'))
+    )
+
+    gallery = tuple(
+        GalleryImageRecord(
+            row['title'], row['subtitle'],
+            row['image_url'],
+            image_variants(GalleryImage, 'image', row['image_variants']),
+        )
+        for row in _pop_stamps(rows['gallery'], timestamps)
+    )
+
+    typing_texts = tuple(row['text'] for row in _pop_stamps(rows['typing_texts'], timestamps))
+
+    stats = Stats(
+        projects=len(projects),
+        achievements=len(achievements),
+        certificates=len(certificates),
+        coffee=profile.cups_of_coffee if profile else 1000,
+    )
+
+    return PortfolioSnapshot(
+        version=version,
+        profile=profile,
+        education=education,
+        skill_categories=skill_categories,
+        projects=projects,
+        achievements=achievements,
+        certificates=certificates,
+        gallery=gallery,
+        typing_texts=typing_texts,
+        stats=stats,
+        last_modified=max(filter(None, timestamps + [changed_at]), default=None),
+        section_versions=section_versions,
+    )
+
+
+def build_snapshot(version):
+    """Load every active portfolio row in a fixed number of queries"""
+    # Versions are read first, so a fragment is never cached under a
+    # version newer than the rows it was rendered from
+    section_versions = get_section_versions()
+    rows = {name: list(queryset) for name, queryset in snapshot_querysets().items()}
+    return assemble_snapshot(version, rows, get_content_changed_at(), section_versions)
+
+
+async def abuild_snapshot(version):
+    """build_snapshot() using the async ORM"""
+    section_versions = await aget_section_versions()
+    rows = {}
+    for name, queryset in snapshot_querysets().items():
+        rows[name] = [row async for row in queryset]
+    return assemble_snapshot(version, rows, await aget_content_changed_at(), section_versions)
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot():
+    """Return the snapshot for the current content version, building it at most once per worker"""
+    global _snapshot
+    version = get_content_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _snapshot_lock:
+        # Another thread may have built it while we waited
+        if _snapshot is None or _snapshot.version != version:
+            _snapshot = build_snapshot(version)
+            cache.set(last_modified_key(version), _snapshot.last_modified, settings.PORTFOLIO_PAGE_CACHE_TIMEOUT)
+        return _snapshot
+
+
+async def aget_snapshot(version=None):
+    """get_snapshot() for async views; concurrent first requests may each build it"""
+    global _snapshot
+    if version is None:
+        version = await aget_content_version()
+    snapshot = _snapshot
+    if snapshot is None or snapshot.version != version:
+        snapshot = _snapshot = await abuild_snapshot(version)
+        await cache.aset(last_modified_key(version), snapshot.last_modified, settings.PORTFOLIO_PAGE_CACHE_TIMEOUT)
+    return snapshot
+
+
+def current_snapshot():
+    """The snapshot this worker built last, whatever its version, or None"""
+    return _snapshot
+
+
+_missing = object()
+
+
+def last_modified_key(version):
+    return f'portfolio:last_modified:{version}'
+
+
+def get_last_modified():
+    """
+    Newest change time for the current content version.
+    Shared through the cache so workers without a warm snapshot can still
+    answer conditional requests without touching the database.
+    """
+    version = get_content_version()
+    last_modified = peek_last_modified(version)
+    if last_modified is _missing:
+        # get_snapshot() shares it through the cache when it builds the snapshot
+        last_modified = get_snapshot().last_modified
+    return last_modified
+
+
+async def aget_last_modified(version):
+    """get_last_modified() for async views"""
+    last_modified = await apeek_last_modified(version)
+    if last_modified is _missing:
+        last_modified = (await aget_snapshot(version)).last_modified
+    return last_modified
+
+
+def peek_last_modified(version):
+    """The change time for version if this worker or the cache has it, else _missing; never builds the snapshot"""
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot.last_modified
+    return cache.get(last_modified_key(version), _missing)
+
+
+async def apeek_last_modified(version):
+    """peek_last_modified() for async views"""
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot.last_modified
+    return await cache.aget(last_modified_key(version), _missing)
+
+
+def cached_last_modified():
+    """get_last_modified() if it is known without building the snapshot, else None"""
+    last_modified = peek_last_modified(get_content_version())
+    return None if last_modified is _missing else last_modified
+
+
+async def acached_last_modified(version):
+    """cached_last_modified() for async views"""
+    last_modified = await apeek_last_modified(version)
+    return None if last_modified is _missing else last_modified
@@ -0,0 +1,47 @@
+"""
+Static files storage for collectstatic.
+
+WhiteNoise's compressed manifest storage with the build step of assets.py
+in front of it: the site's CSS and JavaScript are minified and the critical
+CSS is written before every file is fingerprinted and compressed, so the
+minified versions are what get the hashed names and far-future caching.
+"""
+from django.core.files.base import ContentFile
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+from .assets import CRITICAL_CSS, MINIFIED_DIRS, STYLESHEET, build_critical_css, minify_css, minify_js
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+class PortfolioStaticFilesStorage(CompressedManifestStaticFilesStorage):
+
+    def post_process(self, paths, dry_run=False, **options):
+        if not dry_run:
+            paths = self.build_assets(paths)
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+
+    def build_assets(self, paths):
+        """
+        Minify the collected copies of the site's CSS and JS and add CRITICAL_CSS.
+        paths maps each collected path to its (source storage, source path);
+        rewritten files are read back from this storage instead.
+        """
+        paths = dict(paths)
+        for path, (storage, source) in list(paths.items()):
+            extension = path[path.rfind('.'):]
+            if not path.startswith(MINIFIED_DIRS) or extension not in MINIFIERS or '.min.' in path:
+                continue
+            with storage.open(source) as f:
+                content = f.read().decode('utf-8')
+            if path == STYLESHEET:
+                self.replace(CRITICAL_CSS, build_critical_css(content))
+                paths[CRITICAL_CSS] = (self, CRITICAL_CSS)
+            self.replace(path, MINIFIERS[extension](content))
+            paths[path] = (self, path)
+        return paths
+
+    def replace(self, path, content):
+        if self.exists(path):
+            self.delete(path)
+        self._save(path, ContentFile(content.encode('utf-8')))
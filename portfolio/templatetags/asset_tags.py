@@ -0,0 +1,17 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from portfolio.assets import get_critical_css
+
+register = template.Library()
+
+
+@register.simple_tag
+def critical_css():
+    """
+    Inlines the critical CSS of the page (see portfolio/assets.py) in a <style>
+    element, so the first screen renders before the full stylesheet arrives.
+    """
+    # CSS escapes keep a "</style>" inside a string from closing the element
+    css = get_critical_css().replace('</', '<\\/')
+    return mark_safe(f'<style>{css}</style>')
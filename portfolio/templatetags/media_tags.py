@@ -1,4 +1,8 @@
 from django import template
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+
+from portfolio.timing import phase
 
 register = template.Library()
 
@@ -21,7 +25,42 @@ def media_url(value):
     
     # If it has a .url attribute (FileField), use that
     if hasattr(value, 'url'):
-        return value.url
+        with phase('media'):
+            return value.url
     
     # Fallback: return the string (likely a relative path)
     return str_value
+
+
+def srcset(sources):
+    return ', '.join(f'{url} {width}w' for width, url in sources)
+
+
+@register.simple_tag
+def responsive_image(image, variants, alt='', sizes='100vw', loading='lazy', **attrs):
+    """
+    Renders an image with its resized derivatives (see portfolio/images.py):
+    a <picture> with a WebP source, JPEG srcset fallback, width/height for
+    layout and lazy loading. Without derivatives it falls back to a plain <img>.
+
+    Usage: {% responsive_image project.image project.image_variants alt=project.title sizes="400px" %}
+    """
+    variants = variants or {}
+    img_attrs = {'src': media_url(image), 'alt': alt}
+    if variants.get('jpeg'):
+        img_attrs['srcset'] = srcset(variants['jpeg'])
+        img_attrs['sizes'] = sizes
+    if variants.get('width'):
+        img_attrs['width'] = variants['width']
+        img_attrs['height'] = variants['height']
+    img_attrs['loading'] = loading
+    img_attrs['decoding'] = 'async'
+    img_attrs.update(attrs)
+    img = format_html('<img{}>', flatatt(img_attrs))
+
+    if not variants.get('webp'):
+        return img
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">{}</picture>',
+        srcset(variants['webp']), sizes, img,
+    )
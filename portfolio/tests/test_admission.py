@@ -0,0 +1,52 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from portfolio import admission
+from portfolio.models import ShedCount
+
+
+@override_settings(
+    REDIS_URL=None,
+    PORTFOLIO_CONTACT_BURST=5,
+    PORTFOLIO_CONTACT_REFILL_SECONDS=60,
+    PORTFOLIO_SHED_FLUSH_INTERVAL=3600,
+)
+class AdmissionTests(TestCase):
+    def setUp(self):
+        admission._local_buckets.clear()
+        admission._pending_counts.clear()
+        admission._next_flush = 0.0
+
+    def test_bucket_admits_the_burst_then_refills(self):
+        waits = [admission.take_token('10.0.0.1', now=1000) for _ in range(6)]
+        self.assertEqual(waits[:5], [0] * 5)
+        self.assertEqual(waits[5], 60)
+        # Other clients have their own bucket
+        self.assertEqual(admission.take_token('10.0.0.2', now=1000), 0)
+        self.assertEqual(admission.take_token('10.0.0.1', now=1060), 0)
+
+    def test_concurrent_burst_admits_capacity_only(self):
+        with ThreadPoolExecutor(8) as pool:
+            waits = list(pool.map(lambda _: admission.take_token('10.0.0.3', now=1000), range(40)))
+        self.assertEqual(waits.count(0), 5)
+
+    def test_rejections_are_counted(self):
+        request = RequestFactory().post('/contact/', data='x' * 10, content_type='text/plain', REMOTE_ADDR='10.0.0.4')
+        del request.META['CONTENT_LENGTH']
+        self.assertEqual(admission.check_admission(request).status_code, 411)
+        # The first rejection is saved at once, later ones once the interval is over
+        self.assertEqual(ShedCount.objects.get(reason='length_required').count, 1)
+
+        with self.settings(PORTFOLIO_CONTACT_MAX_BODY=5):
+            request = RequestFactory().post('/contact/', data='x' * 10, content_type='text/plain')
+            for _ in range(3):
+                self.assertEqual(admission.check_admission(request).status_code, 413)
+        self.assertFalse(ShedCount.objects.filter(reason='too_large').exists())
+        self.assertEqual(admission.get_shed_counts()['too_large'], 3)
+
+        admission.flush_shed_counts()
+        self.assertEqual(ShedCount.objects.get(reason='too_large').count, 3)
+        self.assertEqual(admission.get_shed_counts(), {
+            'too_large': 3, 'length_required': 1, 'rate_limited': 0, 'overloaded': 0,
+        })
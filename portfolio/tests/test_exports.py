@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from portfolio.exports import FIELDS, export_chunks
+from portfolio.models import ContactMessage
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.tricky = ContactMessage.objects.create(
+            name='=HYPERLINK("http://evil")', email='a@example.com', subject='Quotes "and", commas',
+            message='Line one\nLine two, 😀', is_read=True,
+        )
+        cls.plain = ContactMessage.objects.create(name='Bob', email='b@example.com', subject='Hi', message='-1')
+        ContactMessage.objects.filter(pk=cls.tricky.pk).update(created_at=datetime(2024, 5, 1, 12, tzinfo=timezone.utc))
+        ContactMessage.objects.filter(pk=cls.plain.pk).update(created_at=datetime(2024, 6, 1, 12, tzinfo=timezone.utc))
+
+    def export(self, format, chunk_size=1, queryset=None):
+        return list(export_chunks(queryset or ContactMessage.objects.all(), format, chunk_size))
+
+    def test_csv_escapes_and_defuses_formulas(self):
+        chunks = self.export('csv')
+        # The header, then one chunk per row
+        self.assertEqual(len(chunks), 3)
+        rows = list(csv.reader(io.StringIO(''.join(chunks))))
+        self.assertEqual(rows[0], list(FIELDS))
+        self.assertEqual(rows[1][2:6], [
+            '\'=HYPERLINK("http://evil")', 'a@example.com', 'Quotes "and", commas', 'Line one\nLine two, 😀',
+        ])
+        self.assertEqual(rows[1][6], 'True')
+        self.assertEqual(rows[2][5], "'-1")
+
+    def test_ndjson_is_one_object_per_line(self):
+        lines = ''.join(self.export('ndjson', chunk_size=10)).splitlines()
+        self.assertEqual(len(lines), 2)
+        first = json.loads(lines[0])
+        self.assertEqual(first['name'], '=HYPERLINK("http://evil")')
+        self.assertEqual(first['message'], 'Line one\nLine two, 😀')
+        self.assertEqual(first['created_at'], '2024-05-01T12:00:00Z')
+        self.assertIs(first['is_read'], True)
+
+    def test_command_filters_by_date_and_status(self):
+        out = io.StringIO()
+        call_command('export_messages', format='ndjson', since='2024-05-15', stdout=out)
+        self.assertEqual([json.loads(line)['id'] for line in out.getvalue().splitlines()], [self.plain.pk])
+
+        out = io.StringIO()
+        call_command('export_messages', format='ndjson', until='2024-05-01', is_read=True, stdout=out)
+        self.assertEqual([json.loads(line)['id'] for line in out.getvalue().splitlines()], [self.tricky.pk])
+
+    def test_admin_action_streams_the_selection(self):
+        self.client.force_login(get_user_model().objects.create_superuser('staff', 'staff@example.com', 'staff'))
+        response = self.client.post('/admin/portfolio/contactmessage/', {
+            'action': 'export_csv', '_selected_action': [self.plain.pk],
+        })
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment;', response['Content-Disposition'])
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row[0] for row in rows], ['id', str(self.plain.pk)])
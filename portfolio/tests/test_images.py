@@ -0,0 +1,88 @@
+import shutil
+import tempfile
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from portfolio.images import variant_names
+from portfolio.models import Project
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def png(width=800, height=400):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), '#6c5ce7').save(buffer, 'PNG')
+    return ContentFile(buffer.getvalue())
+
+
+@override_settings(
+    MEDIA_ROOT=MEDIA_ROOT,
+    PORTFOLIO_IMAGE_WIDTHS=(320, 640),
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+)
+class ImageVariantTests(TestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def create_project(self, content, name='app.png'):
+        project = Project(title='App', description='An app')
+        project.image.save(name, content, save=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        return project
+
+    def assertStored(self, names, stored=True):
+        storage = Project._meta.get_field('image').storage
+        for name in names:
+            self.assertEqual(storage.exists(name), stored, name)
+
+    def test_derivatives_are_generated_and_replaced(self):
+        project = self.create_project(png())
+        variants = project.image_variants
+        self.assertEqual((variants['width'], variants['height']), (800, 400))
+        self.assertEqual([entry[0] for entry in variants['webp']], [320, 640])
+        old_names = variant_names(variants)
+        self.assertEqual(len(old_names), 4)
+        self.assertStored(old_names)
+
+        project.image.save('other.png', png(400, 400), save=False)
+        with self.captureOnCommitCallbacks(execute=True):
+            project.save()
+        self.assertStored(old_names, stored=False)
+        self.assertStored(variant_names(project.image_variants))
+
+    def test_derivatives_are_deleted_with_the_row(self):
+        project = self.create_project(png())
+        names = variant_names(project.image_variants)
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertStored(names, stored=False)
+
+    def test_shared_image_keeps_its_derivatives(self):
+        project = self.create_project(png())
+        names = variant_names(project.image_variants)
+        Project.objects.create(
+            title='Copy', description='Same image', image=project.image.name, image_variants=project.image_variants,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            project.delete()
+        self.assertStored(names)
+
+    def test_unreadable_image_is_retried(self):
+        with self.assertLogs('portfolio.images', 'WARNING'):
+            project = self.create_project(ContentFile(b'not an image'))
+        self.assertEqual(project.image_variants['failed'], project.image.name)
+        self.assertNotIn('source', project.image_variants)
+
+        # The file is fixed in storage; the next save generates the derivatives
+        storage = project.image.storage
+        storage.delete(project.image.name)
+        storage.save(project.image.name, png())
+        project.save()
+        self.assertEqual(project.image_variants['source'], project.image.name)
+        self.assertStored(variant_names(project.image_variants))
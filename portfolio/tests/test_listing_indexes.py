@@ -0,0 +1,36 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from portfolio.benchmarks import seed_content
+from portfolio.management.commands.explain_listings import listing_queries, plan_problems
+
+
+@skipUnless(connection.vendor in ('sqlite', 'postgresql'), 'EXPLAIN checks support SQLite and PostgreSQL')
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ListingIndexTests(TestCase):
+    """
+    Every listing query is read through one of its model's indexes, in order;
+    active-row listings through the partial (order, id) WHERE is_active index.
+    `manage.py explain_listings` runs the same check at production sizes.
+    """
+    size = 500
+
+    @classmethod
+    def setUpTestData(cls):
+        seed_content(projects=cls.size, skills=cls.size * 5, messages=cls.size * 5)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def test_listings_use_their_indexes(self):
+        for name, queryset in listing_queries(self.size):
+            with self.subTest(listing=name):
+                indexes = queryset.model._meta.indexes
+                partial = [index.name for index in indexes if index.condition is not None]
+                plan = queryset.explain()
+                self.assertEqual(plan_problems(queryset, plan), [], plan)
+                self.assertTrue(
+                    any(index_name in plan for index_name in partial or [index.name for index in indexes]),
+                    f'{name} does not use {partial or [index.name for index in indexes]}:\n{plan}',
+                )
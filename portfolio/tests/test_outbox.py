@@ -0,0 +1,90 @@
+from datetime import timedelta
+from smtplib import SMTPException
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from portfolio.models import EmailOutbox
+from portfolio.outbox import deliver_pending, enqueue_contact_message
+
+
+class FailingBackend(EmailBackend):
+    """locmem backend whose server is down"""
+
+    def send_messages(self, messages):
+        raise SMTPException('Connection refused')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+    EMAIL_HOST_USER='owner@example.com',
+    PORTFOLIO_WRITER_QUEUE=False,
+    PORTFOLIO_OUTBOX_IN_PROCESS=False,
+    PORTFOLIO_OUTBOX_RETRY_DELAY=30,
+    PORTFOLIO_OUTBOX_MAX_ATTEMPTS=3,
+)
+class DeliverPendingTests(TestCase):
+    def setUp(self):
+        self.contact = enqueue_contact_message('Jane', 'jane@example.com', 'Hello', 'Hi there')
+        self.item = EmailOutbox.objects.get(message=self.contact)
+
+    def make_due(self):
+        EmailOutbox.objects.filter(pk=self.item.pk).update(next_attempt_at=timezone.now())
+
+    def fail_once(self):
+        before = timezone.now()
+        with self.assertLogs('portfolio.outbox', 'WARNING'):
+            self.assertEqual(deliver_pending(connection=FailingBackend()), (0, 1))
+        self.item.refresh_from_db()
+        return self.item.next_attempt_at - before
+
+    def test_sends_with_the_default_connection(self):
+        self.assertEqual(deliver_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].subject, 'Portfolio Contact: Hello')
+        self.assertEqual(mail.outbox[0].to, ['owner@example.com'])
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.status, EmailOutbox.STATUS_SENT)
+        self.assertEqual(self.item.attempts, 1)
+        self.assertIsNotNone(self.item.sent_at)
+        # Sent rows are not sent again
+        self.assertEqual(deliver_pending(), (0, 0))
+
+    def test_failures_back_off_then_succeed(self):
+        delay = self.fail_once()
+        self.assertEqual(self.item.status, EmailOutbox.STATUS_PENDING)
+        self.assertEqual(self.item.attempts, 1)
+        self.assertIn('Connection refused', self.item.last_error)
+        self.assertGreaterEqual(delay, timedelta(seconds=30))
+        self.assertLess(delay, timedelta(seconds=60))
+
+        # Not retried before its time
+        self.assertEqual(deliver_pending(), (0, 0))
+        self.assertEqual(mail.outbox, [])
+
+        self.make_due()
+        delay = self.fail_once()
+        self.assertEqual(self.item.attempts, 2)
+        self.assertGreaterEqual(delay, timedelta(seconds=60))
+        self.assertLess(delay, timedelta(seconds=120))
+
+        self.make_due()
+        self.assertEqual(deliver_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 1)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.status, EmailOutbox.STATUS_SENT)
+        self.assertEqual(self.item.attempts, 3)
+        self.assertEqual(self.item.last_error, '')
+
+    def test_gives_up_after_max_attempts(self):
+        for _ in range(3):
+            self.make_due()
+            self.fail_once()
+        self.assertEqual(self.item.status, EmailOutbox.STATUS_FAILED)
+        self.assertEqual(self.item.attempts, 3)
+        self.make_due()
+        self.assertEqual(deliver_pending(), (0, 0))
+        self.assertEqual(mail.outbox, [])
@@ -0,0 +1,115 @@
+import brotli
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from portfolio.cache import bump_content_version, get_model_version
+from portfolio.models import Achievement, Education
+
+LOCMEM_CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+def content(response):
+    if response.streaming:
+        return b''.join(response.streaming_content).decode()
+    return response.content.decode()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class PageCacheTests(TestCase):
+    """Edits in the admin reach the cached home page and change its ETag"""
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.achievement = Achievement.objects.create(title='First prize', description='Won it', date='2024')
+
+    def get_home(self, **headers):
+        response = self.client.get('/', headers=headers)
+        return response, content(response)
+
+    def test_cached_page_is_revalidated(self):
+        response, body = self.get_home()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('First prize', body)
+        etag = response['ETag']
+
+        response, body = self.get_home()
+        self.assertEqual(response['ETag'], etag)
+        self.assertIn('First prize', body)
+        self.assertEqual(self.get_home(**{'If-None-Match': etag})[0].status_code, 304)
+
+    def test_save_changes_page_and_etag(self):
+        response, _ = self.get_home()
+        etag = response['ETag']
+
+        self.achievement.title = 'Grand prize'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.achievement.save()
+
+        self.assertEqual(self.get_home(**{'If-None-Match': etag})[0].status_code, 200)
+        response, body = self.get_home()
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('Grand prize', body)
+        self.assertNotIn('First prize', body)
+
+    def test_delete_changes_page_and_etag(self):
+        response, _ = self.get_home()
+        etag = response['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.achievement.delete()
+
+        response, body = self.get_home()
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertNotIn('First prize', body)
+
+    def test_stored_page_is_served_compressed(self):
+        self.get_home()
+        for accept, encoding in (('br, gzip', 'br'), ('gzip', 'gzip')):
+            with self.subTest(accept=accept):
+                response = self.client.get('/', headers={'Accept-Encoding': accept})
+                self.assertEqual(response['Content-Encoding'], encoding)
+        response = self.client.get('/', headers={'Accept-Encoding': 'br'})
+        self.assertIn('First prize', brotli.decompress(response.content).decode())
+
+    def test_api_follows_the_content_version(self):
+        etag = self.client.get('/api/portfolio/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Achievement.objects.create(title='Second prize', description='Also won', date='2025')
+        response = self.client.get('/api/portfolio/')
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertIn('Second prize', content(response))
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class FragmentCacheTests(TestCase):
+    """Section fragments are re-rendered only when a model they show changes"""
+
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            Achievement.objects.create(title='First prize', description='Won it', date='2024')
+            Education.objects.create(degree='BSc', institution='First University', year_range='2020 - 2024')
+
+    def test_edit_bumps_only_its_models(self):
+        achievement = get_model_version('portfolio.Achievement')
+        education = get_model_version('portfolio.Education')
+        with self.captureOnCommitCallbacks(execute=True):
+            Achievement.objects.get().save()
+        self.assertNotEqual(get_model_version('portfolio.Achievement'), achievement)
+        self.assertEqual(get_model_version('portfolio.Education'), education)
+
+    def test_sections_reuse_their_fragments(self):
+        content(self.client.get('/'))
+        # Changed without signals: only a version bump can show the new rows
+        Achievement.objects.update(title='Grand prize')
+        Education.objects.update(institution='Second University')
+
+        bump_content_version('portfolio.Education')
+        body = content(self.client.get('/'))
+        self.assertIn('Second University', body)
+        # The achievements fragment is still the one cached under the old version
+        self.assertIn('First prize', body)
+
+        bump_content_version('portfolio.Achievement')
+        self.assertIn('Grand prize', content(self.client.get('/')))
@@ -0,0 +1,51 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from portfolio.benchmarks import (
+    BENCHMARK_CACHES, BENCHMARK_SETTINGS, QUERY_BUDGETS, all_endpoints, prepare_request,
+    request_endpoint, seed_content,
+)
+
+
+@override_settings(CACHES=BENCHMARK_CACHES, **BENCHMARK_SETTINGS)
+class QueryBudgetTests(TransactionTestCase):
+    """
+    Every endpoint stays within its QUERY_BUDGETS entry, and runs the same
+    number of queries, or fewer, however much content there is. A transaction test
+    case, so writes run as in production (BEGIN/COMMIT, on_commit hooks).
+    `manage.py benchmark_endpoints` measures the same endpoints at larger
+    sizes and with timings.
+    """
+    sizes = (5, 40)
+
+    def setUp(self):
+        cache.clear()
+        user = get_user_model().objects.create_superuser('budget', 'budget@example.com', 'budget')
+        self.client = Client()
+        self.client.force_login(user)
+
+    def measure(self, method, path, cold):
+        prepare_request(self.client, method, path, cold)
+        with CaptureQueriesContext(connection) as queries:
+            response = request_endpoint(self.client, method, path)
+        return response, len(queries)
+
+    def test_query_budgets(self):
+        counts = {}
+        for size in self.sizes:
+            seed_content(projects=size, skills=size * 5, messages=size)
+            for name, budget_name, method, path in all_endpoints():
+                for state, budget in QUERY_BUDGETS[budget_name].items():
+                    with self.subTest(endpoint=name, state=state, projects=size):
+                        response, count = self.measure(method, path, state == 'cold')
+                        self.assertLess(response.status_code, 400)
+                        self.assertLessEqual(count, budget, f'{name} ({state}) ran {count} queries')
+                        counts.setdefault((name, state), {})[size] = count
+
+        smallest, largest = self.sizes[0], self.sizes[-1]
+        for (name, state), by_size in counts.items():
+            with self.subTest(endpoint=name, state=state):
+                self.assertLessEqual(by_size[largest], by_size[smallest], f'{name} ({state}) grows with content: {by_size}')
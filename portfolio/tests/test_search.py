@@ -0,0 +1,58 @@
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from portfolio.models import ContactMessage
+from portfolio.search import matching_messages, search_messages
+
+
+@skipUnless(connection.vendor == 'sqlite', 'Checks the SQLite FTS5 index')
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class InboxSearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.body = ContactMessage.objects.create(
+            name='Ravi', email='ravi@example.com', subject='Hello', message='Looking for a django developer',
+        )
+        cls.sender = ContactMessage.objects.create(
+            name='Django Girls', email='team@djangogirls.org', subject='Workshop', message='Would you mentor?',
+        )
+        cls.other = ContactMessage.objects.create(
+            name='Mei', email='mei@example.com', subject='Flask question', message='How do I deploy?',
+        )
+
+    def search(self, query):
+        return [m.pk for m in search_messages(query)]
+
+    def test_sender_matches_rank_above_the_body(self):
+        self.assertEqual(self.search('django'), [self.sender.pk, self.body.pk])
+
+    def test_every_term_must_match_the_last_as_a_prefix(self):
+        self.assertEqual(self.search('django dev'), [self.body.pk])
+        self.assertEqual(self.search('django flask'), [])
+        self.assertEqual(self.search('deplo'), [self.other.pk])
+
+    def test_operators_are_taken_literally(self):
+        self.assertEqual(self.search('"django" OR flask'), [])
+        self.assertEqual(self.search('mei@example.com'), [self.other.pk])
+        self.assertEqual(self.search('*'), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        ContactMessage.objects.filter(pk=self.other.pk).update(message='Any django tips?')
+        self.assertIn(self.other.pk, self.search('tips'))
+        self.assertEqual(self.search('deploy'), [])
+        self.body.delete()
+        self.assertEqual(self.search('developer'), [])
+
+    def test_matching_keeps_the_queryset_filters(self):
+        ContactMessage.objects.filter(pk=self.body.pk).update(is_read=True)
+        unread = ContactMessage.objects.filter(is_read=False)
+        self.assertEqual(list(matching_messages(unread, 'django')), [self.sender])
+
+    def test_search_endpoint_is_staff_only(self):
+        self.assertEqual(self.client.get('/api/messages/search/', {'q': 'django'}).status_code, 403)
+        self.client.force_login(get_user_model().objects.create_superuser('staff', 'staff@example.com', 'staff'))
+        response = self.client.get('/api/messages/search/', {'q': 'django', 'limit': 1})
+        self.assertEqual([m['id'] for m in response.json()['results']], [self.sender.pk])
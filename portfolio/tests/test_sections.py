@@ -0,0 +1,60 @@
+from django.test import TestCase, override_settings
+
+from portfolio.models import Achievement, Project, ProjectTag
+from portfolio.sections import MAX_LIMIT
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class SectionApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        # Equal orders, so the cursor has to break ties on the pk
+        Achievement.objects.bulk_create(
+            Achievement(title=f'Achievement {i}', description='', date='2024', order=i // 2) for i in range(7)
+        )
+        Achievement.objects.create(title='Hidden', description='', date='2024', order=0, is_active=False)
+        # bulk_create skips the image signals, which would look for the files
+        tagged, _ = Project.objects.bulk_create([
+            Project(title='Tagged', description='', image='projects/a.png', order=1),
+            Project(title='Untagged', description='', image='projects/b.png', order=2),
+        ])
+        ProjectTag.objects.bulk_create([ProjectTag(project=tagged, name='Django'), ProjectTag(project=tagged, name='SQL')])
+
+    def get(self, section, **params):
+        return self.client.get(f'/api/portfolio/{section}/', params)
+
+    def test_cursor_walks_every_active_row_once(self):
+        titles, cursor, pages = [], None, 0
+        while True:
+            params = {'limit': 3, 'fields': 'title'}
+            if cursor:
+                params['cursor'] = cursor
+            page = self.get('achievements', **params).json()
+            titles += [item['title'] for item in page['results']]
+            self.assertTrue(all(item.keys() == {'title'} for item in page['results']))
+            pages += 1
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(pages, 3)
+        self.assertEqual(titles, [f'Achievement {i}' for i in range(7)])
+
+    def test_project_fields_and_tag_filter(self):
+        page = self.get('projects', fields='title,tags', tag='django').json()
+        self.assertEqual(page, {'results': [{'title': 'Tagged', 'tags': ['Django', 'SQL']}], 'next_cursor': None})
+
+    def test_bad_parameters_are_rejected(self):
+        for params, message in (
+            ({'fields': 'title,secret'}, 'Unknown field(s): secret'),
+            ({'limit': 'ten'}, 'limit must be a number.'),
+            ({'limit': MAX_LIMIT + 1}, f'limit must be between 1 and {MAX_LIMIT}.'),
+            ({'limit': 0}, f'limit must be between 1 and {MAX_LIMIT}.'),
+            ({'cursor': 'not-a-cursor'}, 'Invalid cursor.'),
+        ):
+            with self.subTest(params=params):
+                response = self.get('achievements', **params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(message, response.json()['error'])
+
+    def test_unknown_section_is_not_found(self):
+        self.assertEqual(self.get('secrets').status_code, 404)
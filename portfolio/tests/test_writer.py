@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.db import OperationalError
+from django.test import TransactionTestCase
+
+from portfolio.models import TypingText
+from portfolio.writer import WriteQueue
+
+
+class WriteQueueTests(TransactionTestCase):
+    def setUp(self):
+        self.queue = WriteQueue(batch_window=0)
+
+    def test_batches_commit_and_bad_jobs_fail_alone(self):
+        def fail():
+            raise ValueError('bad job')
+
+        with self.assertLogs('portfolio.writer', 'WARNING'):
+            futures = [
+                self.queue.enqueue(TypingText.objects.create, text='first'),
+                self.queue.enqueue(fail),
+                self.queue.enqueue(TypingText.objects.create, text='second'),
+            ]
+            self.assertEqual(futures[0].result(5).text, 'first')
+            with self.assertRaisesMessage(ValueError, 'bad job'):
+                futures[1].result(5)
+            self.assertEqual(futures[2].result(5).text, 'second')
+        self.assertEqual(TypingText.objects.count(), 2)
+
+    def test_writer_survives_a_failing_connection(self):
+        error = OperationalError('unable to open database file')
+        with mock.patch('portfolio.writer.close_old_connections', side_effect=[error, None]):
+            with self.assertLogs('portfolio.writer', 'ERROR'):
+                with self.assertRaises(OperationalError):
+                    self.queue.submit(TypingText.objects.create, text='lost', timeout=5)
+            # The same thread keeps serving later submissions
+            thread = self.queue._thread
+            self.assertEqual(self.queue.submit(TypingText.objects.create, text='saved', timeout=5).text, 'saved')
+            self.assertIs(self.queue._thread, thread)
+        self.assertEqual(list(TypingText.objects.values_list('text', flat=True)), ['saved'])
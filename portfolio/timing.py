@@ -0,0 +1,226 @@
+"""
+Server-Timing header and timing log line for each request.
+
+With PORTFOLIO_SERVER_TIMING on, ServerTimingMiddleware splits the time of
+every request into phases, each exclusive of the ones nested in it:
+
+    db        SQL, measured by a connection.execute_wrapper, with the query count
+    context   the portfolio context processor
+    template  rendering the page templates
+    media     resolving media URLs that were not stored with the file
+    view      the rest of the view and the middleware below this one
+    total     the whole request
+
+The phases go out in a Server-Timing header, which browser dev tools show
+next to the request, and in an INFO line on the portfolio.timing logger.
+Pages streamed while they render (see views.stream_home) only report the
+time up to their first byte in the header; the log line is written when
+the stream ends and covers all of it.
+
+Django only sends its template_rendered signal under the test runner, so
+the code doing the work marks its phases with `with phase('template'):`.
+When the setting is off the middleware is removed at startup, and phase()
+costs one context variable lookup.
+"""
+import logging
+import time
+from contextlib import ExitStack, nullcontext
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Reported in this order, after db
+PHASES = ('context', 'template', 'media', 'view')
+
+_current = ContextVar('portfolio_timing', default=None)
+_untimed = nullcontext()
+
+
+class Timing:
+    """Phase durations of one request, in seconds"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.durations = dict.fromkeys(('db',) + PHASES, 0.0)
+        self.queries = 0
+        # Time spent in nested phases and queries, one entry per open phase
+        self._nested = []
+
+    def add(self, name, elapsed):
+        self.durations[name] += elapsed
+        if self._nested:
+            self._nested[-1] += elapsed
+
+    def measure(self, name):
+        return _Phase(self, name)
+
+    def record_query(self, execute, sql, params, many, context):
+        """connection.execute_wrapper() hook"""
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.add('db', time.perf_counter() - start)
+
+    def elapsed(self):
+        return time.perf_counter() - self.start
+
+    def header(self):
+        entries = [f'db;dur={self.durations["db"] * 1000:.2f};desc="{self.queries} queries"']
+        entries += [f'{name};dur={self.durations[name] * 1000:.2f}' for name in PHASES if self.durations[name]]
+        entries.append(f'total;dur={self.elapsed() * 1000:.2f}')
+        return ', '.join(entries)
+
+    def summary(self):
+        summary = {f'{name}_ms': round(duration * 1000, 2) for name, duration in self.durations.items()}
+        summary['queries'] = self.queries
+        summary['total_ms'] = round(self.elapsed() * 1000, 2)
+        return summary
+
+
+class _Phase:
+    __slots__ = ('timing', 'name', 'start')
+
+    def __init__(self, timing, name):
+        self.timing = timing
+        self.name = name
+
+    def __enter__(self):
+        self.timing._nested.append(0.0)
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        nested = self.timing._nested.pop()
+        self.timing.add(self.name, elapsed - nested)
+        # The parent phase subtracts all of this block, not only its own part
+        if self.timing._nested:
+            self.timing._nested[-1] += nested
+
+
+def phase(name):
+    """Context manager adding the time spent in the block to the current request's phase"""
+    timing = _current.get()
+    return _untimed if timing is None else timing.measure(name)
+
+
+def track_queries(timing):
+    """Wrap the query execution of this thread's connections; close the returned stack to stop"""
+    stack = ExitStack()
+    for connection in connections.all():
+        stack.enter_context(connection.execute_wrapper(timing.record_query))
+    return stack
+
+
+def log_timing(request, response, timing):
+    summary = timing.summary()
+    logger.info(
+        "%s %s %s %s",
+        request.method, request.path, response.status_code,
+        ' '.join(f'{key}={value}' for key, value in summary.items()),
+        extra={'server_timing': summary},
+    )
+
+
+class ServerTimingMiddleware:
+    """Adds the Server-Timing header; list it first in MIDDLEWARE so total covers the others"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PORTFOLIO_SERVER_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        timing = Timing()
+        token = _current.set(timing)
+        queries = track_queries(timing)
+        try:
+            with timing.measure('view'):
+                response = self.get_response(request)
+        except BaseException:
+            queries.close()
+            raise
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing, queries)
+
+    async def __acall__(self, request):
+        timing = Timing()
+        token = _current.set(timing)
+        # The ORM runs in the request's sync thread, with that thread's connections
+        queries = await sync_to_async(track_queries)(timing)
+        try:
+            with timing.measure('view'):
+                response = await self.get_response(request)
+        except BaseException:
+            queries.close()
+            raise
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, timing, queries)
+
+    def process_template_response(self, request, response):
+        # TemplateResponses (the admin's) render after the view returns
+        render = response.render
+
+        def timed_render():
+            with phase('template'):
+                return render()
+
+        response.render = timed_render
+        return response
+
+    def finish(self, request, response, timing, queries):
+        response['Server-Timing'] = timing.header()
+        if not response.streaming:
+            queries.close()
+            log_timing(request, response, timing)
+        else:
+            timed_stream = self.atimed_stream if response.is_async else self.timed_stream
+            response.streaming_content = timed_stream(response.streaming_content, request, response, timing, queries)
+        return response
+
+    def timed_stream(self, chunks, request, response, timing, queries):
+        """The streamed body, with the work producing each chunk timed and the log line at the end"""
+        chunks = iter(chunks)
+        _current.set(timing)
+        try:
+            while True:
+                with timing.measure('view'):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            _current.set(None)
+            queries.close()
+            log_timing(request, response, timing)
+
+    async def atimed_stream(self, chunks, request, response, timing, queries):
+        """timed_stream() for async iterators"""
+        chunks = aiter(chunks)
+        _current.set(timing)
+        try:
+            while True:
+                with timing.measure('view'):
+                    chunk = await anext(chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            _current.set(None)
+            queries.close()
+            log_timing(request, response, timing)
@@ -1,10 +1,17 @@
-from django.urls import path
-from . import views
+from django.conf import settings
+from django.urls import path, re_path
+from . import views, async_views
+from .sections import SECTIONS
 
 app_name = 'portfolio'
 
+# Native async views under ASGI (see asgi.py), sync views under WSGI
+public_views = async_views if settings.PORTFOLIO_ASYNC_VIEWS else views
+
 urlpatterns = [
-    path('', views.home, name='home'),
-    path('send-message/', views.send_message, name='send_message'),
-    path('api/portfolio/', views.api_portfolio_data, name='api_portfolio'),
+    path('', public_views.home, name='home'),
+    path('send-message/', public_views.send_message, name='send_message'),
+    path('api/portfolio/', public_views.api_portfolio_data, name='api_portfolio'),
+    re_path(rf"^api/portfolio/(?P<section>{'|'.join(SECTIONS)})/$", views.api_section, name='api_section'),
+    path('api/messages/search/', views.api_search_messages, name='api_search_messages'),
 ]
@@ -1,50 +1,123 @@
-from django.shortcuts import render
-from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
-from django.core.mail import send_mail
 from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.template.loader import render_to_string
+from django.views.decorators.cache import cache_control, never_cache
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import condition
 import json
 
-from .models import (
-    Profile, Education, SkillCategory, Project, Achievement,
-    Certificate, GalleryImage, ContactMessage, TypingText
+from .admission import admission_control
+from .cache import content_etag, get_content_version, version_etag
+from .hints import PROFILE_IMAGE_SIZES, early_hints, home_links
+from .outbox import enqueue_contact_message
+from .responses import (
+    find_stored_response, get_stored_response, minify_html, store_response, stored_response, streamed_response,
 )
+from .search import search_messages
+from .sections import SectionError, parse_limit, section_page
+from .serializers import encode_portfolio, get_encoder
+from .snapshot import cached_last_modified, get_last_modified, get_snapshot
+from .timing import phase
+
+
+def content_last_modified(request, *args, **kwargs):
+    return get_last_modified()
+
+
+def stored_last_modified(request, *args, **kwargs):
+    return cached_last_modified()
+
 
+# Validators come from the content version and snapshot, so a 304 is answered
+# before any rendering. no_cache makes browsers revalidate instead of guessing
+# a freshness lifetime from Last-Modified.
+content_conditional = condition(etag_func=content_etag, last_modified_func=content_last_modified)
+# ETag only, for responses that must not build the snapshot just to get Last-Modified
+version_conditional = condition(etag_func=content_etag)
+# Last-Modified only when already known, for pages that stream while the snapshot is built
+stored_conditional = condition(etag_func=content_etag, last_modified_func=stored_last_modified)
 
+
+HTML_CONTENT_TYPE = 'text/html; charset=utf-8'
+
+
+@cache_control(no_cache=True)
+@stored_conditional
+@early_hints(home_links)
 def home(request):
-    """Main portfolio page"""
+    """Main portfolio page, rendered and compressed once per content version"""
+    version = get_content_version()
+    etag = version_etag(version)
+    stored = find_stored_response('home', version)
+    if stored is None:
+        # First request at this version: send the <head> while the rest renders
+        return streamed_response(request, stream_home(request, version), HTML_CONTENT_TYPE, etag)
+    return stored_response(request, stored, etag)
+
+
+_head = None
+
+
+def get_head():
+    """The minified head.html that index.html starts with, rendered once per process"""
+    global _head
+    if _head is None or settings.DEBUG:
+        with phase('template'):
+            _head = minify_html(render_to_string('head.html'))
+    return _head
+
+
+def page_after_head(html):
+    """The minified index.html from where get_head() ends"""
+    head = get_head()
+    if not html.startswith(head):
+        raise RuntimeError('index.html must start with {% include "head.html" %}')
+    return html[len(head):]
+
+
+def stream_home(request, version):
+    """
+    Yield the page's <head> at once, so the browser fetches the stylesheets
+    it links to while the rest is rendered, then store the whole page.
+    """
+    yield get_head()
     context = get_portfolio_context()
-    return render(request, 'index.html', context)
+    with phase('template'):
+        html = minify_html(render_to_string('index.html', context, request))
+    yield page_after_head(html)
+    store_response('home', version, html, HTML_CONTENT_TYPE)
 
 
-def get_portfolio_context():
+def get_portfolio_context(snapshot=None):
     """Get all portfolio data for template context"""
-    profile = Profile.objects.first()
-    
-    # Count active items for stats
-    project_count = Project.objects.filter(is_active=True).count()
-    achievement_count = Achievement.objects.filter(is_active=True).count()
-    certificate_count = Certificate.objects.filter(is_active=True).count()
-    
+    snapshot = snapshot or get_snapshot()
+    stats = snapshot.stats
+
     context = {
-        'profile': profile,
-        'education_list': Education.objects.filter(is_active=True),
-        'skill_categories': SkillCategory.objects.filter(is_active=True).prefetch_related('skills'),
-        'projects': Project.objects.filter(is_active=True).prefetch_related('tags'),
-        'achievements': Achievement.objects.filter(is_active=True),
-        'certificates': Certificate.objects.filter(is_active=True).select_related('category'),
-        'gallery_images': GalleryImage.objects.filter(is_active=True),
-        'typing_texts': list(TypingText.objects.filter(is_active=True).values_list('text', flat=True)),
-        
+        'profile': snapshot.profile,
+        'education_list': snapshot.education,
+        'skill_categories': snapshot.skill_categories,
+        'projects': snapshot.projects,
+        'achievements': snapshot.achievements,
+        'certificates': snapshot.certificates,
+        'gallery_images': snapshot.gallery,
+        'typing_texts': list(snapshot.typing_texts),
+        'profile_image_sizes': PROFILE_IMAGE_SIZES,
+
         # Stats
-        'project_count': project_count,
-        'achievement_count': achievement_count,
-        'certificate_count': certificate_count,
+        'project_count': stats.projects,
+        'achievement_count': stats.achievements,
+        'certificate_count': stats.certificates,
+
+        # Fragment cache keys for the sections of index.html
+        'section_versions': snapshot.section_versions,
+        'fragment_timeout': settings.PORTFOLIO_PAGE_CACHE_TIMEOUT,
     }
     return context
 
 
 @csrf_exempt
+@admission_control
 def send_message(request):
     """Handle contact form submission"""
     if request.method == 'POST':
@@ -55,43 +128,8 @@ def send_message(request):
             subject = data.get('subject', '')
             message = data.get('message', '')
 
-            # Save to database
-            contact = ContactMessage.objects.create(
-                name=name,
-                email=email,
-                subject=subject,
-                message=message
-            )
-
-            # Try to send email notification
-            try:
-                profile = Profile.objects.first()
-                recipient_email = profile.email if profile else settings.EMAIL_HOST_USER
-                
-                email_body = f"""
-New message from your portfolio website!
-
-Name: {name}
-Email: {email}
-Subject: {subject}
-
-Message:
-{message}
-
----
-Sent from your portfolio contact form
-"""
-                
-                send_mail(
-                    subject=f'Portfolio Contact: {subject}',
-                    message=email_body,
-                    from_email=settings.DEFAULT_FROM_EMAIL,
-                    recipient_list=[recipient_email],
-                    fail_silently=True,
-                )
-            except Exception as e:
-                print(f"Email sending failed: {e}")
-                # Still return success as message was saved
+            # Save to database; the notification email is sent by the outbox worker
+            enqueue_contact_message(name, email, subject, message)
 
             return JsonResponse({
                 'success': True,
@@ -107,72 +145,50 @@ Sent from your portfolio contact form
     return JsonResponse({'error': 'Method not allowed'}, status=405)
 
 
+@cache_control(no_cache=True)
+@content_conditional
 def api_portfolio_data(request):
     """API endpoint to get all portfolio data as JSON"""
-    profile = Profile.objects.first()
-    
-    data = {
-        'profile': {
-            'name': profile.name if profile else '',
-            'tagline': profile.tagline if profile else '',
-            'description': profile.description if profile else '',
-            'email': profile.email if profile else '',
-            'location': profile.location if profile else '',
-            'github_url': profile.github_url if profile else '',
-            'linkedin_url': profile.linkedin_url if profile else '',
-            'leetcode_url': profile.leetcode_url if profile else '',
-            'hackerrank_url': profile.hackerrank_url if profile else '',
-        } if profile else None,
-        'skills': [
-            {
-                'category': cat.name,
-                'icon': cat.icon_class,
-                'skills': [
-                    {'name': s.name, 'icon': s.icon_class, 'proficiency': s.proficiency}
-                    for s in cat.skills.filter(is_active=True)
-                ]
-            }
-            for cat in SkillCategory.objects.filter(is_active=True)
-        ],
-        'projects': [
-            {
-                'title': p.title,
-                'emoji': p.emoji,
-                'description': p.description,
-                'image': p.image.url if p.image else '',
-                'github_url': p.github_url,
-                'live_url': p.live_url,
-                'tags': list(p.tags.values_list('name', flat=True))
-            }
-            for p in Project.objects.filter(is_active=True)
-        ],
-        'achievements': [
-            {
-                'title': a.title,
-                'description': a.description,
-                'date': a.date,
-                'icon': a.icon_class
-            }
-            for a in Achievement.objects.filter(is_active=True)
-        ],
-        'certificates': [
-            {
-                'title': c.title,
-                'issuer': c.issuer,
-                'description': c.description,
-                'icon': c.icon_class,
-                'link': c.get_certificate_link()
-            }
-            for c in Certificate.objects.filter(is_active=True)
-        ],
-        'gallery': [
-            {
-                'title': g.title,
-                'subtitle': g.subtitle,
-                'image': g.image.url if g.image else ''
-            }
-            for g in GalleryImage.objects.filter(is_active=True)
-        ]
-    }
-    
-    return JsonResponse(data)
+    version = get_content_version()
+    stored = get_stored_response(
+        'api', version,
+        lambda: encode_portfolio(get_snapshot()),
+        'application/json',
+    )
+    return stored_response(request, stored, version_etag(version))
+
+
+@cache_control(no_cache=True)
+@version_conditional
+def api_section(request, section):
+    """One section of the portfolio, paginated, with optional ?fields=, ?cursor=, ?limit= and ?tag="""
+    try:
+        page = section_page(section, request.GET)
+    except SectionError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+    return HttpResponse(get_encoder()(page), content_type='application/json')
+
+
+@never_cache
+def api_search_messages(request):
+    """Staff-only full-text search over contact messages, best matches first, with ?q= and ?limit="""
+    if not (request.user.is_staff and request.user.has_perm('portfolio.view_contactmessage')):
+        return JsonResponse({'error': 'Forbidden'}, status=403)
+    try:
+        limit = parse_limit(request.GET.get('limit'))
+    except SectionError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    results = [
+        {
+            'id': m.pk,
+            'name': m.name,
+            'email': m.email,
+            'subject': m.subject,
+            'message': m.message,
+            'is_read': m.is_read,
+            'created_at': m.created_at,
+        }
+        for m in search_messages(request.GET.get('q', ''), limit)
+    ]
+    return JsonResponse({'results': results})
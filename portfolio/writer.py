@@ -0,0 +1,96 @@
+"""
+Single writer queue for SQLite.
+
+SQLite allows one writer at a time, so concurrent inserts from request
+threads queue up on the database lock and can fail with "database is
+locked". With PORTFOLIO_WRITER_QUEUE enabled, writes are handed to one
+thread per process that commits whatever has queued up in a single
+transaction. Callers still block until their write is committed, so the
+view only answers once the row is durable.
+"""
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+
+from django.db import close_old_connections, transaction
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 100
+# How long the writer waits for more jobs before committing a batch
+BATCH_WINDOW = 0.002
+
+
+class WriteQueue:
+    def __init__(self, max_batch=MAX_BATCH, batch_window=BATCH_WINDOW):
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def enqueue(self, func, *args, **kwargs):
+        """Queue func(*args, **kwargs) for the writer thread; the Future resolves once committed"""
+        future = Future()
+        self._queue.put((future, func, args, kwargs))
+        self._ensure_thread()
+        return future
+
+    def submit(self, func, *args, timeout=30, **kwargs):
+        """Run func(*args, **kwargs) on the writer thread and return its result once committed"""
+        return self.enqueue(func, *args, **kwargs).result(timeout)
+
+    def _ensure_thread(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='portfolio-writer', daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        jobs = [self._queue.get()]
+        while len(jobs) < self.max_batch:
+            try:
+                jobs.append(self._queue.get(timeout=self.batch_window))
+            except queue.Empty:
+                break
+        return jobs
+
+    def _run(self):
+        while True:
+            jobs = self._next_batch()
+            try:
+                self._run_batch(jobs)
+            except Exception as e:
+                # E.g. the database is unreachable: fail this batch's callers
+                # at once, and keep the thread alive for the next submissions
+                logger.exception("Writer failed on a batch of %d job(s)", len(jobs))
+                for future, *_ in jobs:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _run_batch(self, jobs):
+        close_old_connections()
+        try:
+            with transaction.atomic():
+                results = [func(*args, **kwargs) for _, func, args, kwargs in jobs]
+        except Exception:
+            logger.warning("Batched write failed, retrying %d job(s) one by one", len(jobs), exc_info=True)
+            self._run_individually(jobs)
+        else:
+            for (future, *_), result in zip(jobs, results):
+                future.set_result(result)
+
+    def _run_individually(self, jobs):
+        # One bad job must not fail the others that shared its batch
+        for future, func, args, kwargs in jobs:
+            try:
+                with transaction.atomic():
+                    result = func(*args, **kwargs)
+            except Exception as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+
+
+write_queue = WriteQueue()
@@ -5,5 +5,12 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'portfolio_backend.settings')
+# Route the public pages to the async views (portfolio/async_views.py)
+os.environ.setdefault('PORTFOLIO_ASYNC_VIEWS', 'True')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once Django is set up; lets the views send 103 Early Hints (portfolio/hints.py)
+from portfolio.hints import early_hints_application  # noqa: E402
+
+application = early_hints_application(django_application)
@@ -39,6 +39,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so its total covers the other middleware; removed unless PORTFOLIO_SERVER_TIMING is on
+    'portfolio.timing.ServerTimingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -71,6 +73,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'portfolio_backend.wsgi.application'
 
+# Serve the public pages with async views; asgi.py enables this by default
+PORTFOLIO_ASYNC_VIEWS = os.getenv('PORTFOLIO_ASYNC_VIEWS', 'False') == 'True'
+
 
 # Database
 # Use PostgreSQL if DATABASE_URL is set, otherwise use SQLite for local development
@@ -92,6 +97,52 @@ else:
         }
     }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['OPTIONS'] = {
+        # WAL lets page reads continue while a write is in flight, and
+        # synchronous=NORMAL is durable across crashes in WAL mode
+        'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL',
+        # Seconds to wait for the write lock instead of failing with "database is locked"
+        'timeout': 20,
+        # Take the write lock up front so waiting writers can't deadlock on lock upgrades
+        'transaction_mode': 'IMMEDIATE',
+    }
+
+# Funnel contact-form writes through one batching writer thread per process (SQLite only)
+PORTFOLIO_WRITER_QUEUE = (
+    DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3'
+    and os.getenv('PORTFOLIO_WRITER_QUEUE', 'True') == 'True'
+)
+
+
+# Cache
+# Use Redis if REDIS_URL is set, otherwise a file-based cache shared by all workers on the host
+REDIS_URL = os.environ.get("REDIS_URL")
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', BASE_DIR / '.django_cache'),
+        }
+    }
+
+# Namespace cache keys per deploy so pages rendered against old static files are never served
+CACHES['default']['KEY_PREFIX'] = os.getenv('CACHE_KEY_PREFIX', os.getenv('RENDER_GIT_COMMIT', ''))
+
+# How long a rendered page stays cached (seconds); edits invalidate it immediately
+PORTFOLIO_PAGE_CACHE_TIMEOUT = int(os.getenv('PORTFOLIO_PAGE_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# Callable used to encode the JSON API payload, e.g. 'portfolio.serializers.orjson_encoder'
+PORTFOLIO_JSON_ENCODER = os.getenv('PORTFOLIO_JSON_ENCODER', 'portfolio.serializers.json_encoder')
+
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -120,12 +171,16 @@ USE_TZ = True
 # Static files (CSS, JavaScript, Images)
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
-STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATIC_ROOT = os.getenv('STATIC_ROOT', BASE_DIR / 'staticfiles')
 
 # Media files (Uploaded files)
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Widths (px) of the resized copies made of uploaded images, see portfolio/images.py
+PORTFOLIO_IMAGE_WIDTHS = (320, 640, 960, 1280)
+PORTFOLIO_IMAGE_QUALITY = 80
+
 # Cloudinary Configuration
 CLOUDINARY_STORAGE = {
     'CLOUD_NAME': os.getenv('CLOUDINARY_CLOUD_NAME', ''),
@@ -133,12 +188,22 @@ CLOUDINARY_STORAGE = {
     'API_SECRET': os.getenv('CLOUDINARY_API_SECRET', ''),
 }
 
-# Use Cloudinary for media storage in production
-if not DEBUG:
-    DEFAULT_FILE_STORAGE = 'cloudinary_storage.storage.MediaCloudinaryStorage'
-
-# WhiteNoise for static files in production
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Django 5.1 dropped DEFAULT_FILE_STORAGE and STATICFILES_STORAGE in favour of STORAGES
+STORAGES = {
+    # Use Cloudinary for media storage in production
+    'default': {
+        'BACKEND': (
+            'cloudinary_storage.storage.MediaCloudinaryStorage'
+            if not DEBUG and CLOUDINARY_STORAGE['CLOUD_NAME']
+            else 'django.core.files.storage.FileSystemStorage'
+        ),
+    },
+    # WhiteNoise's compressed manifest storage, minifying the site's CSS and JS
+    # and writing its critical CSS first (see portfolio/assets.py)
+    'staticfiles': {
+        'BACKEND': 'portfolio.storage.PortfolioStaticFilesStorage',
+    },
+}
 
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -154,14 +219,51 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_ALL_ORIGINS = DEBUG
 
 # Email Configuration
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
-EMAIL_HOST = 'smtp.gmail.com'
-EMAIL_PORT = 587
-EMAIL_USE_TLS = True
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.getenv('EMAIL_HOST', 'smtp.gmail.com')
+EMAIL_PORT = int(os.getenv('EMAIL_PORT', 587))
+EMAIL_USE_TLS = os.getenv('EMAIL_USE_TLS', 'True') == 'True'
+EMAIL_TIMEOUT = 10
 EMAIL_HOST_USER = os.getenv('EMAIL_HOST_USER', '')
 EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD', '')
 DEFAULT_FROM_EMAIL = os.getenv('EMAIL_HOST_USER', '')
 
+# Contact notification outbox (see portfolio/outbox.py)
+# The Procfile's worker runs `manage.py send_outbox`; turn this on instead for
+# deploys without a worker process, to deliver from a thread in the web process
+PORTFOLIO_OUTBOX_IN_PROCESS = os.getenv('PORTFOLIO_OUTBOX_IN_PROCESS', 'False') == 'True'
+PORTFOLIO_OUTBOX_POLL_INTERVAL = 60
+PORTFOLIO_OUTBOX_MAX_ATTEMPTS = 8
+PORTFOLIO_OUTBOX_RETRY_DELAY = 30
+PORTFOLIO_OUTBOX_LEASE = 300
+
+# Contact form admission control (see portfolio/admission.py)
+PORTFOLIO_CONTACT_MAX_BODY = 16 * 1024
+# Each client may send a burst of this many messages, then one per refill period
+PORTFOLIO_CONTACT_BURST = 5
+PORTFOLIO_CONTACT_REFILL_SECONDS = 60
+# Contact submissions handled at once per process
+PORTFOLIO_CONTACT_MAX_CONCURRENCY = 4
+# Rejections are counted in memory and added to the database at most this often (seconds)
+PORTFOLIO_SHED_FLUSH_INTERVAL = 10
+# Reverse proxies in front of the app that append to X-Forwarded-For (1 on Render)
+PORTFOLIO_PROXY_COUNT = int(os.getenv('PORTFOLIO_PROXY_COUNT', 0))
+
+# Server-Timing header and timing log line per request (see portfolio/timing.py).
+# It tells anyone how long the queries took, so leave it off unless measuring.
+PORTFOLIO_SERVER_TIMING = os.getenv('PORTFOLIO_SERVER_TIMING', 'False') == 'True'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'portfolio.timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 # Admin customization
 ADMIN_SITE_HEADER = "Amrita's Portfolio Admin"
 ADMIN_SITE_TITLE = "Portfolio Admin"
@@ -335,6 +335,19 @@ projectCards.forEach(card => {
     });
 });
 
+// ========================================
+// Gallery Marquee Loop
+// ========================================
+// The track scrolls by half its width, so the items are appended once more
+// here instead of being rendered twice in the page
+document.querySelectorAll('.gallery-track').forEach(track => {
+    Array.from(track.children).forEach(item => {
+        const clone = item.cloneNode(true);
+        clone.setAttribute('aria-hidden', 'true');
+        track.appendChild(clone);
+    });
+});
+
 // ========================================
 // Certificate Card Hover Effect
 // ========================================